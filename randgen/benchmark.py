@@ -0,0 +1,210 @@
+import argparse
+import csv
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from randgen.datafields import *
+from randgen.datasets import Dataset
+from randgen.exporterfactory import ExporterFactory
+from randgen.exporters import CsvExporter
+
+SIZES = (10000, 100000, 1000000, 10000000)
+
+FIELDS = {
+    'CityField' : lambda: CityField('city'),
+    'CountryField' : lambda: CountryField('country'),
+    'DateField' : lambda: DateField('date', fromYear=2000, toYear=2020),
+    'EmailField' : lambda: EmailField('email'),
+    'IncrementField' : lambda: IncrementField('id'),
+    'IpAddressField' : lambda: IpAddressField('ip'),
+    'NameField' : lambda: NameField('name'),
+    'NumberField' : lambda: NumberField('amount', type='float', lowerBound=0, upperBound=1000),
+    'StringField' : lambda: StringField('code', length=8),
+    'CustomField' : lambda: CustomField('custom', os.path.join('csv', 'cities.csv'))
+}
+
+EXPORTERS = ('csv', 'json', 'jsonl', 'xml', 'npy', 'npz', 'arrow', 'parquet')
+
+class DictWriterCsvExporter(CsvExporter):
+
+    def export(self, batches=None):
+        filename, path, batches, headers = self.getDatasetInfo(batches)
+        with open(path + '/' + filename + '.csv', 'w', encoding='utf8') as outFile:
+            writer = csv.DictWriter(outFile, fieldnames=headers, lineterminator = '\n')
+            writer.writeheader()
+            for batch in batches:
+                for row in batch:
+                    entry = {}
+                    for index, value in enumerate(row):
+                        entry.update({headers[index] : value})
+                    writer.writerow(entry)
+
+def createSampleDataset(n, path):
+    dataset = Dataset(n, 'Benchmark', 'benchmark', path, 'csv')
+    dataset.addDatafield(IncrementField('id'))
+    dataset.addDatafield(NameField('name'))
+    dataset.addDatafield(EmailField('email'))
+    dataset.addDatafield(NumberField('amount', type='float', lowerBound=0, upperBound=1000))
+    dataset.addDatafield(StringField('code', length=8))
+    return dataset
+
+def repeatBatch(batch, n, columnar=False):
+    size = len(batch[0]) if columnar else len(batch)
+    for start in range(0, n, size):
+        if columnar:
+            yield [column[:n - start] for column in batch]
+        else:
+            yield batch[:n - start]
+
+def timeExport(exporter, batch, n):
+    start = time.perf_counter()
+    exporter.export(repeatBatch(batch, n))
+    return time.perf_counter() - start
+
+def benchmarkCsvWriters(n, path, batchSize=Dataset.BATCH_SIZE):
+    dataset = createSampleDataset(n, path)
+    batch = dataset.generateBatch(min(batchSize, n))
+    results = {}
+    for name, exporter in (('dictwriter', DictWriterCsvExporter(dataset)), ('writerows', CsvExporter(dataset))):
+        seconds = timeExport(exporter, batch, n)
+        results[name] = {'seconds' : seconds, 'rowsPerSecond' : n / seconds}
+    return results
+
+def getPeakRss():
+    if resource is None:
+        return None
+    peakRss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peakRss if sys.platform == 'darwin' else peakRss * 1024
+
+def benchmarkField(name, n, batchSize=Dataset.BATCH_SIZE):
+    dataset = Dataset(n, 'Benchmark', 'benchmark', '.', 'csv')
+    field = FIELDS[name]()
+    field.preload()
+    dataset.addDatafield(field)
+    start = time.perf_counter()
+    for _ in dataset.generateBatches(batchSize):
+        pass
+    return time.perf_counter() - start
+
+def benchmarkExporter(type, n, path, batchSize=Dataset.BATCH_SIZE):
+    dataset = createSampleDataset(n, path)
+    dataset.setType(type)
+    exporter = ExporterFactory.create(dataset)
+    batch = dataset.generateBatch(min(batchSize, n), exporter.COLUMNAR, exporter.TYPED)
+    start = time.perf_counter()
+    exporter.export(repeatBatch(batch, n, exporter.COLUMNAR))
+    return time.perf_counter() - start
+
+def runCase(kind, name, n):
+    result = {'kind' : kind, 'name' : name, 'rows' : n}
+    try:
+        if kind == 'field':
+            seconds = benchmarkField(name, n)
+        else:
+            with tempfile.TemporaryDirectory() as path:
+                seconds = benchmarkExporter(name, n, path)
+    except ImportError as e:
+        result['skipped'] = str(e)
+        return result
+    result['seconds'] = seconds
+    result['rowsPerSecond'] = n / seconds
+    result['peakRss'] = getPeakRss()
+    return result
+
+def runCaseInSubprocess(kind, name, n):
+    command = [sys.executable, '-m', 'randgen.benchmark', '--case', kind, name, str(n)]
+    completed = subprocess.run(command, stdout=subprocess.PIPE, check=True)
+    return json.loads(completed.stdout)
+
+def getCases(sizes, fields, exporters):
+    cases = []
+    for n in sizes:
+        cases.extend(('field', name, n) for name in fields)
+        cases.extend(('exporter', name, n) for name in exporters)
+    return cases
+
+def getCaseKey(result):
+    return (result['kind'], result['name'], result['rows'])
+
+def compareResults(results, baseline, tolerance):
+    baselineResults = {getCaseKey(result) : result for result in baseline['results']}
+    regressions = []
+    for result in results['results']:
+        previous = baselineResults.get(getCaseKey(result))
+        if previous is None or 'rowsPerSecond' not in result or 'rowsPerSecond' not in previous:
+            continue
+        ratio = result['rowsPerSecond'] / previous['rowsPerSecond']
+        if ratio < 1 - tolerance:
+            regressions.append(dict(result, baselineRowsPerSecond=previous['rowsPerSecond'], ratio=ratio))
+    return regressions
+
+def formatResult(result):
+    label = '{} {} {}'.format(result['kind'], result['name'], result['rows'])
+    if 'skipped' in result:
+        return '{}: skipped ({})'.format(label, result['skipped'])
+    peakRss = result['peakRss']
+    memory = '{:.1f} MiB'.format(peakRss / (1 << 20)) if peakRss is not None else 'n/a'
+    return '{}: {:.0f} rows/sec ({:.2f} s, peak RSS {})'.format(label, result['rowsPerSecond'], result['seconds'], memory)
+
+def parseList(value):
+    return [item for item in value.split(',') if item]
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Benchmark randgen fields and exporters.')
+    parser.add_argument('--sizes', type=lambda value: [int(size) for size in parseList(value)], default=list(SIZES))
+    parser.add_argument('--fields', type=parseList, default=list(FIELDS))
+    parser.add_argument('--exporters', type=parseList, default=list(EXPORTERS))
+    parser.add_argument('--output')
+    parser.add_argument('--baseline')
+    parser.add_argument('--tolerance', type=float, default=0.1)
+    parser.add_argument('--csv-writers', action='store_true')
+    parser.add_argument('--case', nargs=3, metavar=('KIND', 'NAME', 'ROWS'), help=argparse.SUPPRESS)
+    arguments = parser.parse_args(args)
+    if arguments.case:
+        kind, name, n = arguments.case
+        json.dump(runCase(kind, name, int(n)), sys.stdout)
+        return 0
+    if arguments.csv_writers:
+        n = max(arguments.sizes)
+        with tempfile.TemporaryDirectory() as path:
+            csvResults = benchmarkCsvWriters(n, path)
+        for name, result in csvResults.items():
+            print('{}: {:.0f} rows/sec ({:.2f} s)'.format(name, result['rowsPerSecond'], result['seconds']))
+        return 0
+    unknown = [name for name in arguments.fields if name not in FIELDS] + [name for name in arguments.exporters if name not in EXPORTERS]
+    if unknown:
+        parser.error('unknown benchmark cases: {}'.format(', '.join(unknown)))
+    results = {
+        'python' : platform.python_version(),
+        'platform' : platform.platform(),
+        'results' : []
+    }
+    for kind, name, n in getCases(arguments.sizes, arguments.fields, arguments.exporters):
+        result = runCaseInSubprocess(kind, name, n)
+        results['results'].append(result)
+        print(formatResult(result))
+    if arguments.output:
+        with open(arguments.output, 'w') as outFile:
+            json.dump(results, outFile, indent=4)
+    if arguments.baseline:
+        with open(arguments.baseline, 'r') as inFile:
+            baseline = json.load(inFile)
+        regressions = compareResults(results, baseline, arguments.tolerance)
+        for regression in regressions:
+            print('regression: {} {} {}: {:.0f} rows/sec, baseline {:.0f} rows/sec ({:.0%})'.format(regression['kind'], regression['name'], regression['rows'], regression['rowsPerSecond'], regression['baselineRowsPerSecond'], regression['ratio']))
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
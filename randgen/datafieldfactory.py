@@ -1,22 +1,23 @@
-from randgen.datafields import *
+from randgen.registry import FIELD_REGISTRY
 
 class DataFieldFactory:
 
+    @classmethod
+    def register(cls, key, fieldClass):
+        FIELD_REGISTRY.register(key, fieldClass)
+
     @classmethod
     def create(cls, key, values):
-        lookup = {
-            'cityfield' : CityField,
-            'countryfield' : CountryField,
-            'datefield' : DateField,
-            'emailfield' : EmailField,
-            'incrementfield' : IncrementField,
-            'ipaddressfield' : IpAddressField,
-            'namefield' : NameField,
-            'numberfield' : NumberField,
-            'stringfield' : StringField,
-            'customfield' : CustomField
-        }
-        if key in lookup:
-            return lookup[key](**values)
+        fieldClass = FIELD_REGISTRY.get(key)
+        if fieldClass is not None:
+            return fieldClass(**values)
         else:
             raise ValueError('Wrong key for datafield entry: {}'.format(key))
+
+    @classmethod
+    def createFromEntry(cls, datafield):
+        importDataField = None
+        for fieldKey, values in datafield.items():
+            key = fieldKey.split('_')[0]
+            importDataField = cls.create(key, values)
+        return importDataField
@@ -1,10 +1,24 @@
-import csv
 import datetime
-import random
+import ipaddress
+import math
+import operator
 import string
+import struct
 import sys
 
 from randgen.importers import Importer
+import randgen.randomstreams as randomstreams
+from randgen.referencedata import CITIES_FILE, COUNTRIES_FILE, ReferenceDataRegistry
+from randgen.sampling import FeistelPermutation, createUniqueSampler
+import randgen.utils as utils
+
+RAW_STRING = 'string'
+RAW_INT64 = 'int64'
+RAW_FLOAT64 = 'float64'
+RAW_TIMESTAMP = 'timestamp'
+
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
 
 class AbstractField:
 
@@ -12,6 +26,11 @@ class AbstractField:
         self.name = name
         self.numItems = 0
         self.id = self.__class__.__name__.lower() + '_' + str(id(self))
+        self.preparedKey = None
+        self.prepared = None
+        self.random = randomstreams.defaultRandom
+        self.generator = None
+        self.streamKey = None
     
     def getName(self):
         return self.name
@@ -21,9 +40,75 @@ class AbstractField:
     
     def setNumItems(self, numItems):
         self.numItems = numItems
+
+    def seek(self, rowIndex):
+        pass
+
+    def seedBlock(self, seed, fieldIndex, blockIndex):
+        self.random = randomstreams.createRandom(seed, fieldIndex, blockIndex)
+        self.generator = None
+        self.streamKey = (seed, fieldIndex, blockIndex)
+
+    def clearSeed(self):
+        self.random = randomstreams.defaultRandom
+        self.generator = None
+        self.streamKey = None
+
+    def getRandom(self):
+        return self.random
+
+    def drawIntegers(self, upper, k):
+        generator = self.getGenerator()
+        if generator is not None:
+            return generator.integers(0, upper, size=k).tolist()
+        return [value % upper for value in struct.unpack('<%dQ' % k, self.random.randbytes(8 * k))]
+
+    def getGenerator(self):
+        if self.generator is None:
+            if self.streamKey is None:
+                self.generator = randomstreams.getDefaultGenerator()
+            else:
+                self.generator = randomstreams.createGenerator(*self.streamKey)
+        return self.generator
+    
+    def getPreparedKey(self):
+        return None
+
+    def prepare(self):
+        return None
+
+    def preload(self):
+        self.getPrepared()
+
+    def getReferenceFiles(self):
+        return []
+
+    def getParameters(self):
+        import inspect
+        parameters = inspect.signature(type(self).__init__).parameters.values()
+        return {parameter.name : getattr(self, parameter.name, None) for parameter in parameters if parameter.name != 'self' and parameter.kind not in (parameter.VAR_POSITIONAL, parameter.VAR_KEYWORD)}
+
+    def getPrepared(self):
+        key = self.getPreparedKey()
+        if self.prepared is None or key != self.preparedKey:
+            self.prepared = self.prepare()
+            self.preparedKey = key
+        return self.prepared
     
     def generateValue(self):
         pass
+
+    def generateBatch(self, k):
+        return [self.generateValue() for _ in range(k)]
+
+    def getRawType(self):
+        return RAW_STRING
+
+    def generateRawBatch(self, k):
+        return self.generateBatch(k)
+
+    def formatBatch(self, values):
+        return values
     
     def jsonify(self):
         return {
@@ -33,55 +118,90 @@ class AbstractField:
         }
         
     def generateValues(self):
-        result = [self.name]
-        for _ in range(self.numItems):
-            value = self.generateValue()
-            result.append(value)
-        return result
+        return [self.name] + self.generateBatch(self.numItems)
 
 class CityField(AbstractField):
 
-    def __init__(self, name, country=None):
+    UNIFORM_CITY = 0
+    UNIFORM_COUNTRY = 1
+    WEIGHTED = 2
+
+    def __init__(self, name, country=None, strategy=UNIFORM_CITY):
         super().__init__(name)
         self.country = country
-        self.cities = self.fetchCities()
+        self.strategy = strategy
+        self.cityTable = None
     
     def getCountry(self):
         return self.country
     
     def setCountry(self, country):
         self.country = country
+
+    def getStrategy(self):
+        return self.strategy
     
+    def setStrategy(self, strategy):
+        self.strategy = strategy
+    
+    def getCityTable(self):
+        if self.cityTable is None:
+            self.cityTable = ReferenceDataRegistry.getCities()
+        return self.cityTable
+
+    def preload(self):
+        super().preload()
+        self.getCityTable()
+
+    def getReferenceFiles(self):
+        return [CITIES_FILE]
+
     def getCities(self):
-        return self.cities
+        return self.getCityTable().asDict()
     
     def fetchCities(self):
-        cities = {}
-        with open('csv/cities.csv', 'r', encoding='utf-8') as csvFile:
-            csvReader = csv.reader(csvFile, delimiter=',')
-            for index, row in enumerate(csvReader):
-                if index > 0:
-                    if cities.get(row[1]) == None:
-                        cities[row[1]] = [row[0]]
-                    else:
-                        cities[row[1]].append(row[0])
-        return cities
+        return ReferenceDataRegistry.getCities().asDict()
+    
+    def isWeighted(self):
+        return self.strategy == self.WEIGHTED and self.getCityTable().hasWeights()
+
+    def getCityRange(self):
+        if self.country != None:
+            return self.getCityTable().getRange(self.country)
+        elif self.strategy == self.UNIFORM_COUNTRY:
+            return self.random.choice(self.getCityTable().getRanges())
+        return (0, len(self.getCityTable().getNames()))
+
+    def drawIndex(self, start, stop):
+        if self.isWeighted():
+            probabilities, aliases = self.getCityTable().getAliasTable(start, stop)
+            index = self.random.randrange(stop - start)
+            return start + (index if self.random.random() < probabilities[index] else aliases[index])
+        return self.random.randrange(start, stop)
     
     def generateValue(self):
-        randomCity = None
-        if self.country == None:
-            listOfCities = random.choice(list(self.cities.values()))
-        else:
-            if self.cities.get(self.country) != None:
-                listOfCities = self.cities[self.country]
-            else:
-                return ''
-        randomCity = random.choice(listOfCities)
-        return randomCity
+        cityRange = self.getCityRange()
+        if cityRange == None:
+            return ''
+        return self.getCityTable().getNames()[self.drawIndex(*cityRange)]
+
+    def generateBatch(self, k):
+        names = self.getCityTable().getNames()
+        if self.country == None and self.strategy == self.UNIFORM_COUNTRY:
+            randrange = self.random.randrange
+            return [names[randrange(start, stop)] for start, stop in self.random.choices(self.getCityTable().getRanges(), k=k)]
+        cityRange = self.getCityRange()
+        if cityRange == None:
+            return [''] * k
+        if self.isWeighted():
+            return [names[self.drawIndex(*cityRange)] for _ in range(k)]
+        start, stop = cityRange
+        return self.random.choices(names[start:stop] if stop - start < len(names) else names, k=k)
     
     def jsonify(self):
         result = super().jsonify()
         result[self.id]['country'] = self.country
+        result[self.id]['strategy'] = self.strategy
         return result
 
 class CountryField(AbstractField):
@@ -89,7 +209,7 @@ class CountryField(AbstractField):
     def __init__(self, name, abbr=False):
         super().__init__(name)
         self.abbr = abbr
-        self.countries = self.fetchCountries()
+        self.countryTable = None
     
     def getAbbr(self):
         return self.abbr
@@ -97,32 +217,66 @@ class CountryField(AbstractField):
     def setAbbr(self, abbr):
         self.abbr = abbr
     
+    def getCountryTable(self):
+        if self.countryTable is None:
+            self.countryTable = ReferenceDataRegistry.getCountries()
+        return self.countryTable
+
+    def preload(self):
+        super().preload()
+        self.getCountryTable()
+
+    def getReferenceFiles(self):
+        return [COUNTRIES_FILE]
+
     def getCountries(self):
-        return self.countries
+        return self.getCountryTable().asList()
     
     def fetchCountries(self):
-        countries = []
-        with open('csv\countries.csv', 'r') as csvFile:
-            csvReader = csv.reader(csvFile, delimiter=',')
-            for index, row in enumerate(csvReader):
-                if index > 0:
-                    countries.append([row[0], row[3]])
-        return countries
+        return ReferenceDataRegistry.getCountries().asList()
+
+    def getValues(self):
+        return self.getCountryTable().getCodes() if self.abbr else self.getCountryTable().getNames()
     
     def generateValue(self):
-        country = random.choice(self.countries)
-        return country[0] if self.abbr else country[1]
+        return self.random.choice(self.getValues())
+
+    def generateBatch(self, k):
+        return self.random.choices(self.getValues(), k=k)
 
     def jsonify(self):
         result = super().jsonify()
         result[self.id]['abbr'] = self.abbr
         return result
 
+class FormatCache(dict):
+
+    MIDNIGHT = datetime.datetime(2000, 1, 1)
+
+    def __init__(self, segmentFormat, startOrdinal=None):
+        super().__init__()
+        self.segmentFormat = segmentFormat
+        self.startOrdinal = startOrdinal
+
+    def __missing__(self, key):
+        if self.startOrdinal is None:
+            value = (self.MIDNIGHT + datetime.timedelta(seconds=key)).strftime(self.segmentFormat)
+        else:
+            value = datetime.date.fromordinal(self.startOrdinal + key).strftime(self.segmentFormat)
+        self[key] = value
+        return value
+
 class DateField(AbstractField):
 
     LOWER_YEAR = 1900
     UPPER_YEAR = 2080
 
+    DATE_SEGMENT = 0
+    TIME_SEGMENT = 1
+    DATE_DIRECTIVES = frozenset('aAbBhdejmUWyYCgGuVwxDF')
+    TIME_DIRECTIVES = frozenset('HIklMSpfXTRr')
+    CONSTANT_DIRECTIVES = frozenset('%ntzZ')
+
     def __init__(self, name, dateFormat='%m-%d-%Y', fromYear=None, fromMonth=1, fromDay=1, toYear=None, toMonth=1, toDay=1, addTime=True):
         super().__init__(name)
         self.dateFormat = dateFormat
@@ -182,32 +336,91 @@ class DateField(AbstractField):
     def getDay(self, day):
         return day if day >= 1 and day <= 31 else 1
 
-    def generateValue(self):
-        cleanFromYear = self.getFromYear()
-        cleanToYear = self.getToYear()
-        fromMonth = self.getMonth(self.fromMonth)
-        fromDay = self.getDay(self.fromDay)
-        toMonth = self.getMonth(self.toMonth)
-        toDay = self.getMonth(self.toDay)
-        if self.addTime:
-            hour = random.randint(0,23)
-            minute = random.randint(0,59)
-            second = random.randint(0,59)
-            startDate = datetime.datetime(cleanFromYear, fromMonth, fromDay, hour, minute, second)
-            endDate = datetime.datetime(cleanToYear, toMonth, toDay, hour, minute, second)
-        else:
-            startDate = datetime.date(cleanFromYear, fromMonth, fromDay)
-            endDate = datetime.date(cleanToYear, toMonth, toDay)
-
+    def getDateRange(self):
+        startDate = datetime.datetime(self.getFromYear(), self.getMonth(self.fromMonth), self.getDay(self.fromDay))
+        endDate = datetime.datetime(self.getToYear(), self.getMonth(self.toMonth), self.getDay(self.toDay))
         if endDate < startDate:
             endDate, startDate = startDate, endDate
+        return startDate, max((endDate - startDate).days, 1)
+
+    def getPreparedKey(self):
+        return (self.fromYear, self.fromMonth, self.fromDay, self.toYear, self.toMonth, self.toDay, self.dateFormat)
+
+    def prepare(self):
+        startDate, numDays = self.getDateRange()
+        segments = self.getFormatSegments(self.dateFormat)
+        if segments is None:
+            return (startDate, numDays, None)
+        startOrdinal = startDate.toordinal()
+        caches = []
+        for kind, segmentFormat in segments:
+            caches.append((kind, FormatCache(segmentFormat, startOrdinal if kind == self.DATE_SEGMENT else None)))
+        return (startDate, numDays, caches)
+
+    def getFormatSegments(self, dateFormat):
+        segments = []
+        position = 0
+        while position < len(dateFormat):
+            if dateFormat[position] == '%':
+                token = dateFormat[position:position + 2]
+                directive = token[1:]
+                if directive in self.DATE_DIRECTIVES:
+                    kind = self.DATE_SEGMENT
+                elif directive in self.TIME_DIRECTIVES:
+                    kind = self.TIME_SEGMENT
+                elif directive in self.CONSTANT_DIRECTIVES:
+                    kind = None
+                else:
+                    return None
+            else:
+                token = dateFormat[position]
+                kind = None
+            position += len(token)
+            if segments and (kind is None or segments[-1][0] == kind):
+                segments[-1][1].append(token)
+            else:
+                segments.append((self.DATE_SEGMENT if kind is None else kind, [token]))
+        if not segments:
+            return None
+        return [(kind, ''.join(tokens)) for kind, tokens in segments]
+
+    def generateValue(self):
+        return self.generateBatch(1)[0]
+
+    def getRawType(self):
+        return RAW_TIMESTAMP
 
-        diff = endDate - startDate
-        randDays = random.randrange(diff.days)
-        randomDate = startDate + datetime.timedelta(randDays)
-        randomDate = randomDate.strftime(self.dateFormat)
+    def generateOffsets(self, k):
+        _, numDays, _ = self.getPrepared()
+        days = self.drawIntegers(numDays, k)
+        seconds = self.drawIntegers(86400, k) if self.addTime else None
+        return days, seconds
 
-        return str(randomDate)
+    def generateRawBatch(self, k):
+        startDate = self.getPrepared()[0]
+        days, seconds = self.generateOffsets(k)
+        timedelta = datetime.timedelta
+        if seconds is None:
+            return [startDate + timedelta(days=day) for day in days]
+        return [startDate + timedelta(days=day, seconds=second) for day, second in zip(days, seconds)]
+
+    def formatBatch(self, values):
+        dateFormat = self.dateFormat
+        return [value.strftime(dateFormat) for value in values]
+
+    def generateBatch(self, k):
+        caches = self.getPrepared()[2]
+        if caches is None:
+            return self.formatBatch(self.generateRawBatch(k))
+        days, seconds = self.generateOffsets(k)
+        if seconds is None:
+            seconds = [0] * k
+        columns = [list(map(cache.__getitem__, days if kind == self.DATE_SEGMENT else seconds)) for kind, cache in caches]
+        if len(columns) == 1:
+            return columns[0]
+        if len(columns) == 2:
+            return list(map(operator.add, *columns))
+        return list(map(''.join, zip(*columns)))
     
     def jsonify(self):
         result = super().jsonify()
@@ -245,21 +458,32 @@ class EmailField(AbstractField):
     
     def setUnique(self, unique):
         self.unique = unique
+
+    def seek(self, rowIndex):
+        self.currentIndex = rowIndex
     
     def generateValue(self):
         self.currentIndex += 1
         if self.unique:
-            return random.choice(self.LOCAL_PARTS) + str(self.currentIndex) + '@' + random.choice(self.DOMAINS)
+            return self.random.choice(self.LOCAL_PARTS) + str(self.currentIndex) + '@' + self.random.choice(self.DOMAINS)
+        else:
+            return self.random.choice(self.LOCAL_PARTS) + '@' + self.random.choice(self.DOMAINS)
+
+    def generateBatch(self, k):
+        localParts = self.random.choices(self.LOCAL_PARTS, k=k)
+        domains = self.random.choices(self.DOMAINS, k=k)
+        if self.unique:
+            indices = range(self.currentIndex + 1, self.currentIndex + k + 1)
+            result = [localPart + str(index) + '@' + domain for localPart, index, domain in zip(localParts, indices, domains)]
         else:
-            return random.choice(self.LOCAL_PARTS) + '@' + random.choice(self.DOMAINS)
+            result = [localPart + '@' + domain for localPart, domain in zip(localParts, domains)]
+        self.currentIndex += k
+        return result
     
     def jsonify(self):
-        return {
-            self.getId() : {
-                'name' : self.name,
-                'unique' : self.unique
-            }
-        }
+        result = super().jsonify()
+        result[self.id]['unique'] = self.unique
+        return result
 
 class IncrementField(AbstractField):
 
@@ -273,10 +497,21 @@ class IncrementField(AbstractField):
     
     def setStartingValue(self, startValue):
         self.startValue = startValue
+
+    def seek(self, rowIndex):
+        self.currentIndex = self.startValue + rowIndex
     
     def generateValue(self):
         self.currentIndex += 1
         return self.currentIndex
+
+    def generateBatch(self, k):
+        result = list(range(self.currentIndex + 1, self.currentIndex + k + 1))
+        self.currentIndex += k
+        return result
+
+    def getRawType(self):
+        return RAW_INT64 if self.startValue >= INT64_MIN and self.startValue + self.numItems <= INT64_MAX else RAW_STRING
     
     def jsonify(self):
         result = super().jsonify()
@@ -289,22 +524,49 @@ class IpAddressField(AbstractField):
     IPv_6 = 1
     IP_BOTH = 2
 
-    def __init__(self, name, type=IP_BOTH):
+    IPv_6_FORMAT = ':'.join(['%x'] * 8)
+
+    OCTETS = tuple('%d.' % octet for octet in range(256))
+    LAST_OCTETS = tuple('%d\n' % octet for octet in range(256))
+
+    def __init__(self, name, type=IP_BOTH, network=None):
         super().__init__(name)
         self.name = name
         self.type = type
+        self.network = network
     
     def getType(self):
         return self.type
     
     def setType(self, type):
         self.type = type
+
+    def getNetwork(self):
+        return self.network
+
+    def setNetwork(self, network):
+        self.network = network
+
+    def getPreparedKey(self):
+        return self.network
+
+    def prepare(self):
+        if self.network is None:
+            return None
+        network = ipaddress.ip_network(self.network, strict=False)
+        return (network.version, int(network.network_address), int(network.hostmask))
+
+    def getAddressType(self):
+        prepared = self.getPrepared()
+        if prepared is None:
+            return self.type
+        return self.IPv_4 if prepared[0] == 4 else self.IPv_6
     
     def generateIPv4(self):
-        return ":".join(['{}'.format(random.randint(0,255)) for _ in range(4)])
+        return self.generateIPv4Batch(1)[0]
     
     def generateIPv6(self):
-        return ":".join(["%x" % random.randint(0,65535) for _ in range(8)])
+        return self.generateIPv6Batch(1)[0]
     
     def generateIP(self, type):
           if type == self.IPv_4:
@@ -313,15 +575,70 @@ class IpAddressField(AbstractField):
             return self.generateIPv6()
     
     def generateValue(self):
-        if self.type == self.IP_BOTH:
-            addrType = random.randint(self.IPv_4, self.IPv_6)
-            return self.generateIP(addrType)
-        else:
-            return self.generateIP(self.type)
+        addrType = self.getAddressType()
+        if addrType == self.IP_BOTH:
+            addrType = self.random.randint(self.IPv_4, self.IPv_6)
+        return self.generateIP(addrType)
+
+    def getAddressBytes(self, size, k):
+        addresses = self.random.randbytes(size * k)
+        prepared = self.getPrepared()
+        if prepared is None or not addresses:
+            return addresses
+        _, base, hostmask = prepared
+        hostmask = int.from_bytes(hostmask.to_bytes(size, 'big') * k, 'big')
+        base = int.from_bytes(base.to_bytes(size, 'big') * k, 'big')
+        return ((int.from_bytes(addresses, 'big') & hostmask) | base).to_bytes(size * k, 'big')
+
+    def formatIPv4Bytes(self, addresses):
+        if not addresses:
+            return []
+        parts = list(map(self.OCTETS.__getitem__, addresses))
+        parts[3::4] = map(self.LAST_OCTETS.__getitem__, addresses[3::4])
+        result = ''.join(parts).split('\n')
+        result.pop()
+        return result
+
+    def generateIPv4Batch(self, k):
+        return self.formatIPv4Bytes(self.getAddressBytes(4, k))
+
+    def generateIPv6Batch(self, k):
+        addrFormat = self.IPv_6_FORMAT
+        return [addrFormat % hextets for hextets in struct.iter_unpack('>8H', self.getAddressBytes(16, k))]
+
+    def generateIPBatch(self, type, k):
+        if type == self.IPv_4:
+            return self.generateIPv4Batch(k)
+        elif type == self.IPv_6:
+            return self.generateIPv6Batch(k)
+        return [None] * k
+
+    def generateBatch(self, k):
+        addrType = self.getAddressType()
+        if addrType != self.IP_BOTH:
+            return self.generateIPBatch(addrType, k)
+        types = self.random.choices((self.IPv_4, self.IPv_6), k=k)
+        ipv4 = iter(self.generateIPv4Batch(types.count(self.IPv_4)))
+        ipv6 = iter(self.generateIPv6Batch(types.count(self.IPv_6)))
+        return [next(ipv4) if addrType == self.IPv_4 else next(ipv6) for addrType in types]
+
+    def getRawType(self):
+        return RAW_INT64 if self.getAddressType() == self.IPv_4 else RAW_STRING
+
+    def generateRawBatch(self, k):
+        if self.getAddressType() != self.IPv_4:
+            return self.generateBatch(k)
+        return list(struct.unpack('>%dI' % k, self.getAddressBytes(4, k)))
+
+    def formatBatch(self, values):
+        if self.getAddressType() != self.IPv_4:
+            return values
+        return self.formatIPv4Bytes(struct.pack('>%dI' % len(values), *values))
 
     def jsonify(self):
         result = super().jsonify()
         result[self.id]['type'] = self.type
+        result[self.id]['network'] = self.network
         return result
 
 class NameField(AbstractField):
@@ -334,7 +651,10 @@ class NameField(AbstractField):
     ]
 
     def generateValue(self):
-        return random.choice(self.NAMES)
+        return self.random.choice(self.NAMES)
+
+    def generateBatch(self, k):
+        return self.random.choices(self.NAMES, k=k)
     
     def jsonify(self):
         return super().jsonify()
@@ -401,58 +721,122 @@ class NumberField(AbstractField):
         return True
 
     def getNumber(self, lower, upper):
-        if self.type == "int":
-            return str(random.randint(lower, upper))
-        elif self.type == "float":
-            formatter = '{:.' + '{}'.format(self.precision) + 'f}'
-            floatNumber = round(random.uniform(lower, upper), self.precision)
-            return formatter.format(floatNumber)
+        if self.type in ("int", "float"):
+            return self.getPrepared()[4](self.getRawNumber(lower, upper))
     
     def getPrefixSymbol(self):
         return self.symbolPrefix + ' ' if self.symbolPrefix.strip() != '' else ''
     
     def getSuffixSymbol(self):
         return ' ' + self.symbolSuffix if self.symbolSuffix.strip() != '' else ''
+
+    def getBounds(self):
+        lower = 0
+        upper = 0
+        if self.lowerBound == None and self.upperBound == None:
+            if self.type == "int":
+                lower = -sys.maxsize + 1
+                upper = sys.maxsize
+            elif self.type == "float":
+                lower = float("-inf")
+                upper = float("inf")
+        elif self.lowerBound != None and self.upperBound == None:
+            lower = self.lowerBound
+            if self.type == "int":
+                upper = sys.maxsize
+            elif self.type == "float":
+                upper = float("inf")
+        elif self.lowerBound == None and self.upperBound != None:
+            upper = self.upperBound
+            if self.type == "int":
+                lower = -sys.maxsize + 1
+            elif self.type == "float":
+                lower = float("-inf")
+        else:
+            lower = self.lowerBound
+            upper = self.upperBound
+        return lower, upper
+     
+    def isNumeric(self):
+        return not self.continuous or self.type in ("int", "float")
+
+    def hasValidDiscretValues(self):
+        return self.discretValues != None and len(self.discretValues) > 0 and self.validDiscretValues()
+
+    def getPreparedKey(self):
+        discretValues = tuple(self.discretValues) if self.discretValues != None else None
+        return (self.type, self.lowerBound, self.upperBound, self.continuous, discretValues, self.precision, self.symbolPrefix, self.symbolSuffix)
+
+    def prepare(self):
+        lower, upper = self.getBounds()
+        if self.continuous and self.type == "float":
+            formatter = ('{:.' + '{}'.format(self.precision) + 'f}').format
+        else:
+            formatter = str
+        valid = self.continuous or self.hasValidDiscretValues()
+        return (lower, upper, self.getPrefixSymbol(), self.getSuffixSymbol(), formatter, valid)
+
+    def getRawNumber(self, lower, upper):
+        if self.type == "int":
+            return self.random.randint(lower, upper)
+        return round(self.random.uniform(lower, upper), self.precision)
      
     def generateValue(self):
-        prefix = self.getPrefixSymbol()
-        suffix = self.getSuffixSymbol()
-        if self.continuous:
-            lower = 0
-            upper = 0
-            if self.lowerBound == None and self.upperBound == None:
-                if self.type == "int":
-                    lower = -sys.maxsize + 1
-                    upper = sys.maxsize
-                elif self.type == "float":
-                    lower = float("-inf")
-                    upper = float("inf")
-            elif self.lowerBound != None and self.upperBound == None:
-                lower = self.lowerBound
-                if self.type == "int":
-                    upper = sys.maxsize
-                elif self.type == "float":
-                    upper = float("inf")
-            elif self.lowerBound == None and self.upperBound != None:
-                upper = self.upperBound
-                if self.type == "int":
-                    lower = -sys.maxsize + 1
-                elif self.type == "float":
-                    lower = float("-inf")
-            else:
-                lower = self.lowerBound
-                upper = self.upperBound
-            
+        lower, upper, prefix, suffix, formatter, valid = self.getPrepared()
+        if not valid:
+            return None
+        if not self.isNumeric():
             return prefix + self.getNumber(lower, upper) + suffix
-
+        if self.continuous:
+            value = self.getRawNumber(lower, upper)
         else:
-            if self.discretValues == None or not len(self.discretValues):
-                return None
-            else:
-                if self.validDiscretValues():
-                    return prefix + str(random.choice(self.discretValues)) + suffix
-                else:
-                    return None
+            value = self.random.choice(self.discretValues)
+        return prefix + formatter(value) + suffix
+
+    def getNumberBatch(self, lower, upper, k):
+        if self.type == "int":
+            if self.getGenerator() is not None and lower >= INT64_MIN and upper <= INT64_MAX:
+                return self.getGenerator().integers(lower, upper, size=k, endpoint=True).tolist()
+            randint = self.random.randint
+            return [randint(lower, upper) for _ in range(k)]
+        elif self.type == "float":
+            if self.getGenerator() is not None and math.isfinite(upper - lower):
+                return self.getGenerator().uniform(lower, upper, size=k).round(self.precision).tolist()
+            uniform = self.random.uniform
+            return [round(uniform(lower, upper), self.precision) for _ in range(k)]
+
+    def getRawType(self):
+        if not self.isNumeric() or not self.getPrepared()[5]:
+            return RAW_STRING
+        if self.continuous:
+            if self.type == "float":
+                return RAW_FLOAT64
+            lower, upper = self.getPrepared()[:2]
+            return RAW_INT64 if lower >= INT64_MIN and upper <= INT64_MAX else RAW_STRING
+        if all(isinstance(value, int) and INT64_MIN <= value <= INT64_MAX for value in self.discretValues):
+            return RAW_INT64
+        return RAW_FLOAT64
+
+    def generateRawBatch(self, k):
+        lower, upper, _, _, _, valid = self.getPrepared()
+        if not valid:
+            return [None] * k
+        if not self.isNumeric():
+            return super().generateBatch(k)
+        if self.continuous:
+            return self.getNumberBatch(lower, upper, k)
+        return self.random.choices(self.discretValues, k=k)
+
+    def formatBatch(self, values):
+        _, _, prefix, suffix, formatter, valid = self.getPrepared()
+        if not valid or not self.isNumeric():
+            return values
+        if prefix or suffix:
+            return [prefix + formatter(value) + suffix for value in values]
+        return list(map(formatter, values))
+
+    def generateBatch(self, k):
+        return self.formatBatch(self.generateRawBatch(k))
     
     def jsonify(self):
         result = super().jsonify()
@@ -531,18 +915,84 @@ class StringField(AbstractField):
             return finalCharset
 
     
+    def getPreparedKey(self):
+        return (self.charset, self.case, self.includeDigits)
+
+    def prepare(self):
+        charset = self.getFinalCharset()
+        if not charset or len(charset) > 256 or max(map(ord, charset)) > 255:
+            return (charset, None, None)
+        size = len(charset)
+        limit = 256 - 256 % size
+        table = bytes(ord(charset[value % size]) if value < limit else 0 for value in range(256))
+        return (charset, table, bytes(range(limit, 256)) or None)
+    
     def getString(self, charset):
-        return "".join(random.choice(charset) for _ in range(self.length))
+        return "".join(self.random.choice(charset) for _ in range(self.length))
 
     def generateValue(self):
         if self.strCount < 1:
             return None
         else:
             finalValue = []
-            charset = self.getFinalCharset()
+            charset = self.getPrepared()[0]
             for _ in range(self.strCount):
                 finalValue.append(self.getString(charset))
             return self.strSep.join(finalValue)
+
+    def getCharacterBytes(self, count):
+        _, table, rejected = self.getPrepared()
+        if rejected is None:
+            return self.random.randbytes(count).translate(table)
+        ratio = 256 / (256 - len(rejected))
+        characters = b''
+        while len(characters) < count:
+            missing = count - len(characters)
+            characters += self.random.randbytes(int(missing * ratio) + 64).translate(table, rejected)
+        return characters[:count]
+
+    def getCharacters(self, count):
+        charset, table, _ = self.getPrepared()
+        if table is None:
+            return ''.join(self.random.choices(charset, k=count))
+        return self.getCharacterBytes(count).decode('latin-1')
+
+    def canAssembleBytes(self, strCount, strSep):
+        charset, table, _ = self.getPrepared()
+        if table is None or '\n' in charset:
+            return False
+        return strCount == 1 or (len(strSep) == 1 and strSep != '\n' and ord(strSep) < 256)
+
+    def assembleBytes(self, characters, k, length, strCount, strSep):
+        wordStride = length + 1
+        cellStride = wordStride * strCount
+        words = bytearray(cellStride * k)
+        for offset in range(length):
+            words[offset::wordStride] = characters[offset::length]
+        if strCount > 1:
+            words[length::wordStride] = strSep.encode('latin-1') * (strCount * k)
+        words[cellStride - 1::cellStride] = b'\n' * k
+        return words[:-1].decode('latin-1').split('\n')
+
+    def generateBatch(self, k):
+        if self.strCount < 1:
+            return [None] * k
+        charset = self.getPrepared()[0]
+        if not charset:
+            return super().generateBatch(k)
+        if k == 0:
+            return []
+        length = self.length
+        strCount = self.strCount
+        strSep = self.strSep
+        if not strSep:
+            length *= strCount
+            strCount = 1
+        if self.canAssembleBytes(strCount, strSep):
+            return self.assembleBytes(self.getCharacterBytes(length * strCount * k), k, length, strCount, strSep)
+        cellLength = length * strCount
+        characters = self.getCharacters(cellLength * k)
+        return [strSep.join([characters[offset:offset + length] for offset in range(start, start + cellLength, length)]) for start in range(0, cellLength * k, cellLength)]
     
     def jsonify(self):
         result = super().jsonify()
@@ -567,8 +1017,13 @@ class CustomField(AbstractField):
         self.fetchBy = fetchBy
         self.unique = unique
         self.delimiter = delimiter
-        self.data = self.getData()
-        self.dups = []
+        self.column = None
+        self.columnLoaded = False
+        self.sampler = None
+        self.uniqueValues = None
+        self.permutation = None
+        self.permutationKey = None
+        self.currentIndex = 0
     
     def getFilePath(self):
         return self.filePath
@@ -605,32 +1060,90 @@ class CustomField(AbstractField):
     
     def setDelimiter(self, delimiter):
         self.delimiter = delimiter
+
+    def setNumItems(self, numItems):
+        super().setNumItems(numItems)
+        self.sampler = None
+
+    def seek(self, rowIndex):
+        self.currentIndex = rowIndex
+
+    def seedBlock(self, seed, fieldIndex, blockIndex):
+        super().seedBlock(seed, fieldIndex, blockIndex)
+        if self.unique and self.getColumn() is not None:
+            self.permutation = self.getPermutation(seed, fieldIndex)
+
+    def clearSeed(self):
+        super().clearSeed()
+        self.permutation = None
     
     def getData(self):
         importer = Importer(self.filePath, self.fetchBy, self.delimiter)
         self.data = importer.importData()
         return self.data
     
-    def getValue(self):
-        value = None
+    def fetchColumn(self):
+        importer = Importer(self.filePath, self.fetchBy, self.delimiter)
         if self.fetchBy == self.COLUMN_INDEX:
-            value = random.choice(self.data[self.columnIndex])
+            return importer.importColumn(self.columnIndex)
         elif self.fetchBy == self.COLUMN_NAME and not self.columnName is None:
-            value = random.choice(self.data[self.columnName])
-        return value
+            return importer.importColumn(self.columnName)
+        return None
+
+    def getColumn(self):
+        if not self.columnLoaded:
+            self.column = self.fetchColumn()
+            self.columnLoaded = True
+        return self.column
+    
+    def getValue(self):
+        column = self.getColumn()
+        return self.random.choice(column) if column is not None else None
+
+    def getSampler(self):
+        if self.sampler is None:
+            self.sampler = createUniqueSampler(len(self.getUniqueValues()), self.numItems or None)
+        return self.sampler
+
+    def preload(self):
+        super().preload()
+        column = self.getColumn()
+        if self.unique and column is not None:
+            self.getUniqueValues()
+
+    def getReferenceFiles(self):
+        return [self.filePath]
+
+    def getUniqueValues(self):
+        if self.uniqueValues is None:
+            self.uniqueValues = tuple(dict.fromkeys(self.getColumn()))
+        return self.uniqueValues
+
+    def getPermutation(self, seed, fieldIndex):
+        key = (seed, fieldIndex)
+        if self.permutation is None or self.permutationKey != key:
+            self.permutation = FeistelPermutation(len(self.getUniqueValues()), utils.deriveSeed(seed, fieldIndex))
+            self.permutationKey = key
+        return self.permutation
 
     def generateValue(self):
-        if self.unique:
-            if len(self.data) < self.numItems:
-                raise ValueError('Data amount is smaller than number of unique entries required ({} data - {} unique entries required)'.format(len(self.data), self.numItems))
-            else:
-                while True:
-                    value = self.getValue()
-                    if not value in self.dups:
-                        self.dups.append(value)
-                        return value
+        if self.unique and self.getColumn() is not None:
+            return self.generateBatch(1)[0]
         else:
             return self.getValue()
+
+    def generateBatch(self, k):
+        if self.getColumn() is None:
+            return [None] * k
+        if self.unique:
+            uniqueValues = self.getUniqueValues()
+            if self.permutation is not None:
+                indices = self.permutation.permuteRange(self.currentIndex, self.currentIndex + k)
+                self.currentIndex += k
+            else:
+                indices = self.getSampler().drawBatch(k, self.random)
+            return [uniqueValues[index] for index in indices]
+        return self.random.choices(self.getColumn(), k=k)
     
     def jsonify(self):
         result = super().jsonify()
@@ -639,4 +1152,5 @@ class CustomField(AbstractField):
         result[self.id]['columnName'] = self.columnName
         result[self.id]['fetchBy'] = self.fetchBy
         result[self.id]['unique'] = self.unique
+        result[self.id]['delimiter'] = self.delimiter
         return result
\ No newline at end of file
@@ -1,19 +1,25 @@
+import json
 import os
+import threading
 
-from randgen.datafields import *
 from randgen.datafieldfactory import DataFieldFactory
-from randgen.exporters import *
-from randgen.exporterfactory import *
+from randgen.exporterfactory import ExporterFactory
+import randgen.parallel as parallel
+import randgen.pipeline as pipeline
+import randgen.randomstreams as randomstreams
 import randgen.utils as utils
 
 class Dataset:
+
+    BATCH_SIZE = 10000
     
-    def __init__(self, n, title, filename, path, type):
+    def __init__(self, n, title, filename, path, type, seed=None):
         self.n = n
         self.title = title
         self.filename = filename
         self.path = path
         self.type = type
+        self.seed = seed
         self.datafields = []
     
     def getN(self):
@@ -46,6 +52,12 @@ class Dataset:
     def setType(self, type):
         self.type = type
     
+    def getSeed(self):
+        return self.seed
+    
+    def setSeed(self, seed):
+        self.seed = seed
+    
     def addDatafield(self, datafield):
         self.datafields.append(datafield)
     
@@ -55,16 +67,155 @@ class Dataset:
     def getDatafields(self):
         return self.datafields
 
-    def generateValues(self):
-        result = []
+    def getHeaders(self):
+        return tuple(field.getName() for field in self.datafields)
+
+    def getRawTypes(self):
+        return tuple(field.getRawType() for field in self.datafields)
+
+    def generateColumns(self, size, typed=False, profiler=None):
+        if profiler is not None:
+            return self.generateProfiledColumns(size, typed, profiler)
+        if typed:
+            return [field.generateRawBatch(size) for field in self.datafields]
+        return [field.generateBatch(size) for field in self.datafields]
+
+    def generateProfiledColumns(self, size, typed, profiler):
+        columns = []
+        for field in self.datafields:
+            with profiler.measure('field:' + field.getName(), size):
+                columns.append(field.generateRawBatch(size) if typed else field.generateBatch(size))
+        return columns
+
+    def transpose(self, columns, profiler=None):
+        if profiler is None:
+            return list(zip(*columns))
+        with profiler.measure('transpose', len(columns[0]) if columns else 0):
+            return list(zip(*columns))
+
+    def generateBatch(self, size, columnar=False, typed=False, profiler=None):
+        columns = self.generateColumns(size, typed, profiler)
+        return columns if columnar else self.transpose(columns, profiler)
+
+    def seedBlock(self, seed, blockStart):
+        blockIndex = blockStart // randomstreams.BLOCK_SIZE
+        for fieldIndex, field in enumerate(self.datafields):
+            field.seedBlock(seed, fieldIndex, blockIndex)
+            field.seek(blockStart)
+
+    def generateSeededBatch(self, start, stop, seed, columnar=False, typed=False, profiler=None):
+        columns = [[] for _ in self.datafields]
+        for blockStart in range(randomstreams.getBlockStart(start), stop, randomstreams.BLOCK_SIZE):
+            self.seedBlock(seed, blockStart)
+            blockColumns = self.generateColumns(min(randomstreams.BLOCK_SIZE, self.n - blockStart), typed, profiler)
+            lower = max(start, blockStart) - blockStart
+            upper = min(stop, blockStart + randomstreams.BLOCK_SIZE) - blockStart
+            for column, blockColumn in zip(columns, blockColumns):
+                column.extend(blockColumn[lower:upper])
+        return columns if columnar else self.transpose(columns, profiler)
+
+    def rows(self, start, stop, seed=None, columnar=False, typed=False):
+        if seed is None:
+            seed = self.seed
+        if seed is None:
+            raise ValueError('Random access to rows requires a seeded dataset')
+        start, stop, _ = slice(start, stop).indices(self.n)
+        stop = max(start, stop)
         for field in self.datafields:
             field.setNumItems(self.n)
-            result.append(field.generateValues())
-        return list(zip(*result))
+        return self.generateSeededBatch(start, stop, seed, columnar, typed)
+
+    def row(self, index, seed=None):
+        if index < 0:
+            index += self.n
+        if not 0 <= index < self.n:
+            raise IndexError('Row index out of range')
+        return self.rows(index, index + 1, seed)[0]
+
+    def generateBatches(self, batchSize=BATCH_SIZE, workers=1, seed=None, columnar=False, typed=False, profiler=None):
+        for field in self.datafields:
+            field.setNumItems(self.n)
+        if seed is None:
+            seed = self.seed
+        if workers != 1:
+            yield from parallel.generateBatches(self, randomstreams.alignToBlocks(batchSize), workers, seed, columnar, typed)
+            return
+        if seed is None:
+            for field in self.datafields:
+                field.clearSeed()
+            for start, stop in parallel.getShards(self.n, batchSize):
+                yield self.generateBatch(stop - start, columnar, typed, profiler)
+            return
+        for start, stop in parallel.getShards(self.n, randomstreams.alignToBlocks(batchSize)):
+            yield self.generateSeededBatch(start, stop, seed, columnar, typed, profiler)
+
+    def generateEncodedBatches(self, dataExporter, batchSize=BATCH_SIZE, workers=1, seed=None):
+        for field in self.datafields:
+            field.setNumItems(self.n)
+        if seed is None:
+            seed = self.seed
+        yield from parallel.generateEncodedBatches(self, dataExporter, randomstreams.alignToBlocks(batchSize), workers, seed)
+
+    def generateExportBatches(self, dataExporter, workers=1, seed=None, profiler=None):
+        if workers != 1 and dataExporter.ENCODES_BATCHES:
+            return self.generateEncodedBatches(dataExporter, workers=workers, seed=seed)
+        return self.generateBatches(workers=workers, seed=seed, columnar=dataExporter.COLUMNAR, typed=dataExporter.TYPED, profiler=profiler)
+
+    def generateValues(self, workers=1, seed=None, typed=False, profiler=None):
+        result = [self.getHeaders()]
+        if profiler is None:
+            for batch in self.generateBatches(workers=workers, seed=seed, typed=typed):
+                result.extend(batch)
+            return result
+        profiler.start()
+        try:
+            for batch in profiler.profileBatches('batches', self.generateBatches(workers=workers, seed=seed, typed=typed, profiler=profiler)):
+                with profiler.measure('collect', len(batch)):
+                    result.extend(batch)
+        finally:
+            profiler.stop()
+        return result
+    
+    def exportData(self, workers=1, seed=None, profiler=None, cache=None, **options):
+        if cache is not None:
+            return cache.export(self, workers, seed, profiler, **options)
+        dataExporter = ExporterFactory.create(self, **options)
+        batches = self.generateExportBatches(dataExporter, workers, seed, profiler)
+        if profiler is None:
+            dataExporter.export(batches)
+            return
+        dataExporter.setProfiler(profiler)
+        profiler.start()
+        try:
+            with profiler.measure('export:' + self.type, self.n):
+                dataExporter.export(batches)
+        finally:
+            dataExporter.setProfiler(None)
+            profiler.stop()
     
-    def exportData(self):
-        dataExporter = ExporterFactory.create(self)
-        dataExporter.export()
+    def exportSharded(self, shardRows=None, shardBytes=None, workers=1, seed=None, **options):
+        import randgen.sharding as sharding
+        return sharding.exportSharded(self, shardRows, shardBytes, workers, seed, **options)
+
+    def exportDataThreaded(self, workers=1, seed=None, queueSize=pipeline.QUEUE_SIZE, cancelEvent=None, **options):
+        dataExporter = ExporterFactory.create(self, **options)
+        batches = pipeline.BatchQueue(self.generateExportBatches(dataExporter, workers, seed), queueSize, cancelEvent)
+        batches.start()
+        try:
+            dataExporter.export(iter(batches))
+        finally:
+            batches.close()
+
+    async def exportDataAsync(self, workers=1, seed=None, queueSize=pipeline.QUEUE_SIZE, **options):
+        import asyncio
+        cancelEvent = threading.Event()
+        task = asyncio.ensure_future(asyncio.to_thread(self.exportDataThreaded, workers, seed, queueSize, cancelEvent, **options))
+        try:
+            await asyncio.shield(task)
+        except asyncio.CancelledError:
+            cancelEvent.set()
+            await asyncio.wait([task])
+            raise
     
     def jsonify(self):
         datasetKey = 'dataset_{unique_id}'.format(unique_id=str(id(self)))
@@ -75,7 +226,8 @@ class Dataset:
                     'title' : self.title,
                     'filename' : self.filename,
                     'path' : self.path,
-                    'type' : self.type
+                    'type' : self.type,
+                    'seed' : self.seed
                 },
                 'datafields' : []
             }
@@ -98,6 +250,23 @@ class DatasetManager:
     def getDatasets(self):
         return self.datasets
     
+    def exportAll(self, workers=1, seed=None, maxConcurrency=None, **options):
+        import concurrent.futures
+        if not self.datasets:
+            return
+        with concurrent.futures.ThreadPoolExecutor(maxConcurrency or len(self.datasets)) as executor:
+            futures = [executor.submit(dataset.exportDataThreaded, workers, seed, **options) for dataset in self.datasets]
+            for future in futures:
+                future.result()
+
+    async def exportAllAsync(self, workers=1, seed=None, maxConcurrency=None, **options):
+        import asyncio
+        semaphore = asyncio.Semaphore(maxConcurrency or max(len(self.datasets), 1))
+        async def export(dataset):
+            async with semaphore:
+                await dataset.exportDataAsync(workers, seed, **options)
+        await asyncio.gather(*(export(dataset) for dataset in self.datasets))
+    
     def isJsonFile(self, filename):
         _, fileExtension = os.path.splitext(filename)
         return fileExtension == '.json'
@@ -121,11 +290,8 @@ class DatasetManager:
             for _, datasetValues in content.items():
                 dataset = Dataset(**datasetValues['info'])
                 datafields = datasetValues['datafields']
-                importDataField = None
                 for datafield in datafields:
-                    for fieldKey, values in datafield.items():
-                        key = fieldKey.split('_')[0]
-                        importDataField = DataFieldFactory.create(key, values)
+                    importDataField = DataFieldFactory.createFromEntry(datafield)
                     if not importDataField is None:
                         dataset.addDatafield(importDataField)
                 self.addDataset(dataset)
\ No newline at end of file
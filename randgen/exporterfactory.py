@@ -1,16 +1,16 @@
-from randgen.exporters import *
+from randgen.registry import EXPORTER_REGISTRY
 
 class ExporterFactory:
+
+    @classmethod
+    def register(cls, datasetType, exporterClass):
+        EXPORTER_REGISTRY.register(datasetType, exporterClass)
     
     @classmethod
-    def create(cls, dataset):
+    def create(cls, dataset, **options):
         datasetType = dataset.getType()
-        lookup = {
-            'csv' : CsvExporter,
-            'json' : JsonExporter,
-            'xml' : XmlExporter
-        }
-        if datasetType in lookup:
-            return lookup[datasetType](dataset)
+        exporterClass = EXPORTER_REGISTRY.get(datasetType)
+        if exporterClass is not None:
+            return exporterClass(dataset, **options)
         else:
-            raise ValueError('Invalid export type: {}'.format(datasetType))
\ No newline at end of file
+            raise ValueError('Invalid export type: {}'.format(datasetType))
@@ -1,66 +1,456 @@
+import contextlib
 import csv
+import io
 import json
-import xml.etree.ElementTree as ET
+import os
+import tempfile
+import textwrap
+import zipfile
+from xml.sax.saxutils import escape
+
+from randgen.datafields import RAW_FLOAT64, RAW_INT64, RAW_TIMESTAMP
+import randgen.npyformat as npyformat
+import randgen.parallel as parallel
+import randgen.streams as streams
+import randgen.utils as utils
+
+pa = None
+
+_AUTO = object()
+
+def loadPyArrow():
+    global pa
+    if pa is None:
+        try:
+            import pyarrow
+            import pyarrow.ipc
+            import pyarrow.parquet
+        except ImportError:
+            return None
+        pa = pyarrow
+    return pa
 
 class DataExporter:
 
+    COLUMNAR = False
+    TYPED = False
+    NEEDS_ROW_COUNT = False
+    STREAM_COMPRESSION = False
+    ENCODES_BATCHES = False
+
     def __init__(self, dataset):
         self.dataset = dataset
+        self.profiler = None
+        self.counter = None
     
     def getDataset(self):
         return self.dataset
     
     def setDataset(self, dataset):
         self.dataset = dataset
+
+    def getProfiler(self):
+        return self.profiler
+
+    def setProfiler(self, profiler):
+        self.profiler = profiler
+
+    def getCounter(self):
+        return self.counter
+
+    def setCounter(self, counter):
+        self.counter = counter
+
+    @classmethod
+    def getShardOptions(cls, dataset, options):
+        return options
     
-    def getDatasetInfo(self):
+    def getDatasetInfo(self, batches=None):
         filename = self.dataset.getFilename()
         path = self.dataset.getPath()
-        data = self.dataset.generateValues()
-        headers = data[0]
-        return (filename, path, data, headers)
+        if batches is None:
+            batches = self.dataset.generateBatches(columnar=self.COLUMNAR, typed=self.TYPED, profiler=self.profiler)
+        if self.profiler is not None:
+            batches = self.profiler.profileBatches('batches', batches, self.COLUMNAR)
+        headers = self.dataset.getHeaders()
+        return (filename, path, batches, headers)
 
-    def export(self):
+    def formatBatch(self, headers, batch):
+        pass
+
+    def formatBatches(self, headers, batches):
+        for batch in batches:
+            if not batch:
+                continue
+            if isinstance(batch, parallel.EncodedBatch):
+                yield batch.getData()
+            else:
+                yield self.formatBatch(headers, batch)
+
+    def export(self, batches=None):
         pass
 
 class CsvExporter(DataExporter):
 
-    def export(self):
-        filename, path, data, headers = self.getDatasetInfo()
-        outFile = open(path + '/' + filename + '.csv', 'w', encoding='utf8')
-        writer = csv.DictWriter(outFile, fieldnames=headers, lineterminator = '\n')
-        writer.writeheader()
-        for row in data[1:]:
-            entry = {}
-            for index, value in enumerate(row):
-                entry.update({headers[index] : value})
-            writer.writerow(entry)
-        outFile.close()
+    STREAM_COMPRESSION = True
+    ENCODES_BATCHES = True
+
+    def __init__(self, dataset, delimiter=',', quoting=csv.QUOTE_MINIMAL, bufferSize=utils.DEFAULT_BUFFER_SIZE, compression=None, compressionThreads=None):
+        super().__init__(dataset)
+        self.delimiter = delimiter
+        self.quoting = quoting
+        self.bufferSize = bufferSize
+        self.compression = compression
+        self.compressionThreads = compressionThreads
+    
+    def getDelimiter(self):
+        return self.delimiter
+    
+    def setDelimiter(self, delimiter):
+        self.delimiter = delimiter
+    
+    def getQuoting(self):
+        return self.quoting
+    
+    def setQuoting(self, quoting):
+        self.quoting = quoting
+    
+    def getBufferSize(self):
+        return self.bufferSize
+    
+    def setBufferSize(self, bufferSize):
+        self.bufferSize = bufferSize
+    
+    def getCompression(self):
+        return self.compression
+    
+    def setCompression(self, compression):
+        self.compression = compression
+
+    def getCompressionThreads(self):
+        return self.compressionThreads
+    
+    def setCompressionThreads(self, compressionThreads):
+        self.compressionThreads = compressionThreads
+
+    def formatBatch(self, headers, batch):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, delimiter=self.delimiter, quoting=self.quoting, lineterminator='\n')
+        writer.writerows(batch)
+        return buffer.getvalue().encode('utf8')
+
+    def export(self, batches=None):
+        filename, path, batches, headers = self.getDatasetInfo(batches)
+        outPath, compression = streams.getOutputPath(path, filename, '.csv', self.compression)
+        with streams.openBinaryOutput(outPath, compression, self.bufferSize, threads=self.compressionThreads, counter=self.counter) as outFile:
+            outFile.write(self.formatBatch(headers, [headers]))
+            for data in self.formatBatches(headers, batches):
+                outFile.write(data)
 
 class JsonExporter(DataExporter):
 
-    def export(self):
-        filename, path, data, headers = self.getDatasetInfo()
-        result = []
-        for row in data[1:]:
-            entry = {}
-            for index, value in enumerate(row):
-                entry.update({headers[index] : value})
-            result.append(entry)
-        with open(path + '/' + filename + '.json', 'w') as outFile:
-            json.dump(result, outFile, indent=4)
+    STREAM_COMPRESSION = True
+    ENCODES_BATCHES = True
+    DEFAULT_INDENT = 4
+    COMPACT_THRESHOLD = 100000
+
+    def __init__(self, dataset, indent=_AUTO, bufferSize=utils.DEFAULT_BUFFER_SIZE, compression=None, compressionThreads=None):
+        super().__init__(dataset)
+        if indent is _AUTO:
+            indent = self.getDefaultIndent(dataset.getN())
+        self.indent = indent
+        self.bufferSize = bufferSize
+        self.compression = compression
+        self.compressionThreads = compressionThreads
+
+    @classmethod
+    def getDefaultIndent(cls, n):
+        return None if n > cls.COMPACT_THRESHOLD else cls.DEFAULT_INDENT
+
+    @classmethod
+    def getShardOptions(cls, dataset, options):
+        if 'indent' in options:
+            return options
+        return dict(options, indent=cls.getDefaultIndent(dataset.getN()))
+    
+    def getIndent(self):
+        return self.indent
+    
+    def setIndent(self, indent):
+        self.indent = indent
+    
+    def getBufferSize(self):
+        return self.bufferSize
+    
+    def setBufferSize(self, bufferSize):
+        self.bufferSize = bufferSize
+    
+    def getCompression(self):
+        return self.compression
+    
+    def setCompression(self, compression):
+        self.compression = compression
+
+    def getCompressionThreads(self):
+        return self.compressionThreads
+    
+    def setCompressionThreads(self, compressionThreads):
+        self.compressionThreads = compressionThreads
+
+    def getEncoder(self):
+        if self.indent is None:
+            return json.JSONEncoder(separators=(',', ':'))
+        return json.JSONEncoder(indent=self.indent)
+
+    def getEntryIndent(self):
+        if self.indent is None:
+            return ''
+        return ' ' * self.indent if isinstance(self.indent, int) else self.indent
+
+    def encodeBatch(self, encoder, headers, batch):
+        return [encoder.encode(dict(zip(headers, row))) for row in batch]
+
+    def formatBatch(self, headers, batch):
+        entries = self.encodeBatch(self.getEncoder(), headers, batch)
+        entryIndent = self.getEntryIndent()
+        if entryIndent:
+            entries = [textwrap.indent(entry, entryIndent) for entry in entries]
+        return ',\n'.join(entries).encode('utf8')
+
+    def openOutput(self, path, filename, extension):
+        outPath, compression = streams.getOutputPath(path, filename, extension, self.compression)
+        return streams.openBinaryOutput(outPath, compression, self.bufferSize, threads=self.compressionThreads, counter=self.counter)
+
+    def export(self, batches=None):
+        filename, path, batches, headers = self.getDatasetInfo(batches)
+        with self.openOutput(path, filename, '.json') as outFile:
+            outFile.write(b'[')
+            separator = b'\n'
+            for data in self.formatBatches(headers, batches):
+                outFile.write(separator)
+                outFile.write(data)
+                separator = b',\n'
+            outFile.write(b']' if separator == b'\n' else b'\n]')
+
+class JsonLinesExporter(JsonExporter):
+
+    def __init__(self, dataset, bufferSize=utils.DEFAULT_BUFFER_SIZE, compression=None, compressionThreads=None):
+        super().__init__(dataset, None, bufferSize, compression, compressionThreads)
+
+    @classmethod
+    def getShardOptions(cls, dataset, options):
+        return options
+
+    def formatBatch(self, headers, batch):
+        return ('\n'.join(self.encodeBatch(self.getEncoder(), headers, batch)) + '\n').encode('utf8')
+
+    def export(self, batches=None):
+        filename, path, batches, headers = self.getDatasetInfo(batches)
+        with self.openOutput(path, filename, '.jsonl') as outFile:
+            for data in self.formatBatches(headers, batches):
+                outFile.write(data)
 
 class XmlExporter(DataExporter):
+
+    STREAM_COMPRESSION = True
+    ENCODES_BATCHES = True
+
+    INDENT = '  '
+
+    def __init__(self, dataset, pretty=False, bufferSize=utils.DEFAULT_BUFFER_SIZE, compression=None, compressionThreads=None):
+        super().__init__(dataset)
+        self.pretty = pretty
+        self.bufferSize = bufferSize
+        self.compression = compression
+        self.compressionThreads = compressionThreads
+    
+    def getPretty(self):
+        return self.pretty
+    
+    def setPretty(self, pretty):
+        self.pretty = pretty
+    
+    def getBufferSize(self):
+        return self.bufferSize
+    
+    def setBufferSize(self, bufferSize):
+        self.bufferSize = bufferSize
+    
+    def getCompression(self):
+        return self.compression
+    
+    def setCompression(self, compression):
+        self.compression = compression
+
+    def getCompressionThreads(self):
+        return self.compressionThreads
+    
+    def setCompressionThreads(self, compressionThreads):
+        self.compressionThreads = compressionThreads
+
+    def getTags(self, headers):
+        return [('<' + header + '>', '</' + header + '>', '<' + header + ' />') for header in headers]
+
+    def serializeRow(self, tags, row):
+        values = []
+        for (openTag, closeTag, emptyTag), value in zip(tags, row):
+            text = escape(str(value))
+            values.append(openTag + text + closeTag if text else emptyTag)
+        if self.pretty:
+            if not values:
+                return self.INDENT + '<entry />\n'
+            valueIndent = '\n' + self.INDENT * 2
+            return self.INDENT + '<entry>' + valueIndent + valueIndent.join(values) + '\n' + self.INDENT + '</entry>\n'
+        if not values:
+            return '<entry />'
+        return '<entry>' + ''.join(values) + '</entry>'
+
+    def formatBatch(self, headers, batch):
+        tags = self.getTags(headers)
+        return ''.join([self.serializeRow(tags, row) for row in batch]).encode('ascii', 'xmlcharrefreplace')
+
+    def export(self, batches=None):
+        filename, path, batches, headers = self.getDatasetInfo(batches)
+        outPath, compression = streams.getOutputPath(path, filename, '.xml', self.compression)
+        with streams.openBinaryOutput(outPath, compression, self.bufferSize, threads=self.compressionThreads, counter=self.counter) as outFile:
+            empty = True
+            for data in self.formatBatches(headers, batches):
+                if empty:
+                    outFile.write(b'<dataset>\n' if self.pretty else b'<dataset>')
+                    empty = False
+                outFile.write(data)
+            if empty:
+                outFile.write(b'<dataset />')
+            else:
+                outFile.write(b'</dataset>')
+
+class ColumnarExporter(DataExporter):
+
+    COLUMNAR = True
+    TYPED = True
+
+class NpyExporter(ColumnarExporter):
+
+    NEEDS_ROW_COUNT = True
+    STREAM_COMPRESSION = True
+
+    def __init__(self, dataset, bufferSize=utils.DEFAULT_BUFFER_SIZE, compression=None, compressionThreads=None):
+        super().__init__(dataset)
+        self.bufferSize = bufferSize
+        self.compression = compression
+        self.compressionThreads = compressionThreads
+    
+    def getBufferSize(self):
+        return self.bufferSize
     
-    def export(self):
-        filename, path, data, headers = self.getDatasetInfo()
-        root = ET.Element('dataset')
-        for row in data[1:]:
-            entry = ET.Element('entry')
-            root.append(entry)
-            for index, value in enumerate(row):
-                valueEntry = ET.SubElement(entry, headers[index])
-                valueEntry.text = str(value)
-        tree = ET.ElementTree(root)
-        with open(path + '/' + filename + '.xml', 'wb') as outFile:
-            tree.write(outFile)
\ No newline at end of file
+    def setBufferSize(self, bufferSize):
+        self.bufferSize = bufferSize
+    
+    def getCompression(self):
+        return self.compression
+    
+    def setCompression(self, compression):
+        self.compression = compression
+
+    def getCompressionThreads(self):
+        return self.compressionThreads
+    
+    def setCompressionThreads(self, compressionThreads):
+        self.compressionThreads = compressionThreads
+
+    def writeColumns(self, filenames, batches, compression=None):
+        rawTypes = self.dataset.getRawTypes()
+        with contextlib.ExitStack() as stack:
+            outFiles = [stack.enter_context(streams.openBinaryOutput(filename, compression, self.bufferSize, threads=self.compressionThreads, counter=self.counter)) for filename in filenames]
+            writers = [npyformat.createColumnWriter(outFile, rawType, self.dataset.getN()) for outFile, rawType in zip(outFiles, rawTypes)]
+            for batch in batches:
+                for writer, column in zip(writers, batch):
+                    writer.write(column)
+            for writer in writers:
+                writer.close()
+
+    def export(self, batches=None):
+        filename, path, batches, headers = self.getDatasetInfo(batches)
+        filename, compression = streams.splitCompression(filename, self.compression)
+        outPath = os.path.join(path, filename)
+        os.makedirs(outPath, exist_ok=True)
+        self.writeColumns([streams.getOutputPath(outPath, header, '.npy', compression)[0] for header in headers], batches, compression)
+
+class NpzExporter(NpyExporter):
+
+    def __init__(self, dataset, bufferSize=utils.DEFAULT_BUFFER_SIZE, compression=None, compressionThreads=None):
+        if compression is None:
+            compression = streams.detectCompression(dataset.getFilename())
+        if compression is not None:
+            raise ValueError('npz archives cannot be compressed with {}'.format(compression))
+        super().__init__(dataset, bufferSize, None, compressionThreads)
+
+    def export(self, batches=None):
+        filename, path, batches, headers = self.getDatasetInfo(batches)
+        with tempfile.TemporaryDirectory() as tempPath:
+            filenames = [os.path.join(tempPath, str(index) + '.npy') for index in range(len(headers))]
+            self.writeColumns(filenames, batches)
+            with zipfile.ZipFile(streams.getOutputPath(path, filename, '.npz')[0], 'w', zipfile.ZIP_STORED) as outFile:
+                for header, columnFilename in zip(headers, filenames):
+                    outFile.write(columnFilename, header + '.npy')
+
+class ArrowExporter(ColumnarExporter):
+
+    EXTENSION = '.arrow'
+
+    def __init__(self, dataset, compression=None):
+        super().__init__(dataset)
+        if loadPyArrow() is None:
+            raise ImportError('pyarrow is required to export {} files'.format(self.EXTENSION))
+        streamCompression = streams.detectCompression(dataset.getFilename())
+        if streamCompression is not None:
+            raise ValueError('{} files cannot be compressed with {}'.format(self.EXTENSION[1:], streamCompression))
+        self.compression = compression
+    
+    def getCompression(self):
+        return self.compression
+    
+    def setCompression(self, compression):
+        self.compression = compression
+
+    def getArrowType(self, rawType):
+        if rawType == RAW_INT64:
+            return pa.int64()
+        elif rawType == RAW_FLOAT64:
+            return pa.float64()
+        elif rawType == RAW_TIMESTAMP:
+            return pa.timestamp('s')
+        return pa.string()
+
+    def getSchema(self, headers):
+        return pa.schema([pa.field(header, self.getArrowType(rawType)) for header, rawType in zip(headers, self.dataset.getRawTypes())])
+
+    def toRecordBatch(self, schema, columns):
+        arrays = []
+        for field, column in zip(schema, columns):
+            if field.type == pa.string():
+                column = [None if value is None else str(value) for value in column]
+            arrays.append(pa.array(column, type=field.type))
+        return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+    def openWriter(self, outPath, schema):
+        options = pa.ipc.IpcWriteOptions(compression=self.compression)
+        return pa.ipc.new_file(outPath, schema, options=options)
+
+    def export(self, batches=None):
+        filename, path, batches, headers = self.getDatasetInfo(batches)
+        schema = self.getSchema(headers)
+        sink = streams.getOutputPath(path, filename, self.EXTENSION)[0]
+        with contextlib.ExitStack() as stack:
+            if self.counter is not None:
+                sink = stack.enter_context(streams.openBinaryOutput(sink, counter=self.counter))
+            writer = stack.enter_context(self.openWriter(sink, schema))
+            for batch in batches:
+                writer.write_batch(self.toRecordBatch(schema, batch))
+
+class ParquetExporter(ArrowExporter):
+
+    EXTENSION = '.parquet'
+
+    def openWriter(self, outPath, schema):
+        return pa.parquet.ParquetWriter(outPath, schema, compression=self.compression or 'snappy')
@@ -1,8 +1,68 @@
+import array
 import csv
+import mmap
 import os
 
+from randgen.referencedata import ReferenceDataRegistry
 import randgen.utils as utils
 
+CHUNK_SIZE = 1 << 20
+
+class Column:
+
+    def __init__(self, values, offsets, encoding='utf-8'):
+        self.values = values
+        self.offsets = offsets
+        self.encoding = encoding
+    
+    def __len__(self):
+        return len(self.offsets) - 1
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError('Column index out of range')
+        return self.values[self.offsets[index]:self.offsets[index + 1]].decode(self.encoding)
+    
+    def __iter__(self):
+        values = self.values
+        offsets = self.offsets
+        encoding = self.encoding
+        for index in range(len(offsets) - 1):
+            yield values[offsets[index]:offsets[index + 1]].decode(encoding)
+
+def iterLines(buffer, encoding='utf-8', chunkSize=CHUNK_SIZE):
+    remainder = b''
+    for start in range(0, len(buffer), chunkSize):
+        lines = (remainder + buffer[start:start + chunkSize]).splitlines(keepends=True)
+        remainder = lines.pop() if lines else b''
+        for line in lines:
+            yield line.decode(encoding)
+    if remainder:
+        yield remainder.decode(encoding)
+
+def loadColumn(filePath, column, delimiter=','):
+    values = bytearray()
+    offsets = array.array('q', [0])
+    with open(filePath, 'rb') as rawFile:
+        if os.fstat(rawFile.fileno()).st_size == 0:
+            return Column(b'', offsets)
+        with mmap.mmap(rawFile.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            csvReader = csv.reader(iterLines(buffer), delimiter=delimiter)
+            if isinstance(column, str):
+                headers = next(csvReader, [])
+                if not column in headers:
+                    raise KeyError(column)
+                column = headers.index(column)
+            for row in csvReader:
+                if len(row) > column:
+                    values += row[column].encode('utf-8')
+                    offsets.append(len(values))
+    return Column(bytes(values), offsets)
+
 class Importer:
 
     def __init__(self, filename, fetchBy, delimiter=','):
@@ -13,19 +73,24 @@ class Importer:
     
     @property
     def filename(self):
-        return self.filename
+        return self._filename
     
     @property
     def delimiter(self):
-        return self.delimiter
+        return self._delimiter
     
     @filename.setter
     def filename(self, filename):
-        self.filename = filename
+        self._filename = filename
     
     @delimiter.setter
     def delimiter(self, delimiter):
-        self.delimiter = delimiter
+        self._delimiter = delimiter
+
+    def importColumn(self, column):
+        if not utils.isValidFile(self.filename, '.csv'):
+            return None
+        return ReferenceDataRegistry.get(self.filename, loadColumn, column, self.delimiter)
     
     def importData(self):
         if not utils.isValidFile(self.filename, '.csv'):
@@ -49,4 +114,4 @@ class Importer:
                     rowIndex += 1
                 rowData = list(zip(*rowData))
                 data = dict((header, rowElem) for header, rowElem in zip(headers, rowData))
-            return data
\ No newline at end of file
+            return data
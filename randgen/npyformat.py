@@ -0,0 +1,91 @@
+import array
+import datetime
+import struct
+import sys
+import tempfile
+
+from randgen.datafields import RAW_FLOAT64, RAW_INT64, RAW_TIMESTAMP
+
+MAGIC = b'\x93NUMPY'
+HEADER_ALIGNMENT = 64
+EPOCH = datetime.datetime(1970, 1, 1)
+SECOND = datetime.timedelta(seconds=1)
+
+DESCRIPTORS = {
+    RAW_INT64 : '<i8',
+    RAW_FLOAT64 : '<f8',
+    RAW_TIMESTAMP : '<M8[s]'
+}
+
+TYPECODES = {
+    RAW_INT64 : 'q',
+    RAW_FLOAT64 : 'd',
+    RAW_TIMESTAMP : 'q'
+}
+
+def getHeader(descriptor, length):
+    header = "{{'descr': '{}', 'fortran_order': False, 'shape': ({},), }}".format(descriptor, length)
+    padding = HEADER_ALIGNMENT - (len(MAGIC) + 4 + len(header) + 1) % HEADER_ALIGNMENT
+    header = (header + ' ' * (padding % HEADER_ALIGNMENT) + '\n').encode('latin1')
+    return MAGIC + b'\x01\x00' + struct.pack('<H', len(header)) + header
+
+def toEpochSeconds(value):
+    if value is None:
+        return -2 ** 63
+    return (value - EPOCH) // SECOND
+
+class NpyColumnWriter:
+
+    def __init__(self, outFile, rawType, length):
+        self.outFile = outFile
+        self.rawType = rawType
+        self.length = length
+        self.outFile.write(getHeader(DESCRIPTORS[rawType], length))
+    
+    def write(self, values):
+        if self.rawType == RAW_TIMESTAMP:
+            values = [toEpochSeconds(value) for value in values]
+        elif self.rawType == RAW_FLOAT64:
+            values = [float('nan') if value is None else value for value in values]
+        data = array.array(TYPECODES[self.rawType], values)
+        if sys.byteorder == 'big':
+            data.byteswap()
+        self.outFile.write(data.tobytes())
+    
+    def close(self):
+        pass
+
+class NpyStringColumnWriter:
+
+    def __init__(self, outFile, length):
+        self.outFile = outFile
+        self.length = length
+        self.maxLength = 0
+        self.spool = tempfile.TemporaryFile()
+    
+    def write(self, values):
+        chunks = []
+        for value in values:
+            value = '' if value is None else str(value)
+            encoded = value.encode('utf-32-le')
+            self.maxLength = max(self.maxLength, len(value))
+            chunks.append(struct.pack('<I', len(value)))
+            chunks.append(encoded)
+        self.spool.write(b''.join(chunks))
+    
+    def close(self):
+        itemSize = max(self.maxLength, 1)
+        self.outFile.write(getHeader('<U{}'.format(itemSize), self.length))
+        self.spool.seek(0)
+        while True:
+            prefix = self.spool.read(4)
+            if not prefix:
+                break
+            valueLength = struct.unpack('<I', prefix)[0]
+            self.outFile.write(self.spool.read(4 * valueLength) + b'\0' * (4 * (itemSize - valueLength)))
+        self.spool.close()
+
+def createColumnWriter(outFile, rawType, length):
+    if rawType in DESCRIPTORS:
+        return NpyColumnWriter(outFile, rawType, length)
+    return NpyStringColumnWriter(outFile, length)
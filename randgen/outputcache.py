@@ -0,0 +1,326 @@
+import copy
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+import randgen.randomstreams as randomstreams
+import randgen.utils as utils
+
+CACHE_VERSION = 4
+DEFAULT_MAX_SIZE = 10 * (1 << 30)
+ARTIFACT_NAME = 'data'
+INDEX_FILE = 'index.json'
+LOCK_FILE = 'index.lock'
+OBJECTS_DIRECTORY = 'objects'
+
+class IndexLock:
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.lockFile = None
+
+    def __enter__(self):
+        self.cache.lock.acquire()
+        try:
+            self.lockFile = open(self.cache.getLockPath(), 'a+b')
+            if fcntl is not None:
+                fcntl.flock(self.lockFile.fileno(), fcntl.LOCK_EX)
+            else:
+                self.lockFile.seek(0)
+                msvcrt.locking(self.lockFile.fileno(), msvcrt.LK_LOCK, 1)
+            self.cache.entries, self.cache.stats = self.cache.loadIndex()
+        except BaseException:
+            self.release()
+            raise
+        return self.cache
+
+    def __exit__(self, excType, excValue, traceback):
+        self.release()
+
+    def release(self):
+        try:
+            if self.lockFile is not None:
+                if fcntl is not None:
+                    fcntl.flock(self.lockFile.fileno(), fcntl.LOCK_UN)
+                else:
+                    self.lockFile.seek(0)
+                    msvcrt.locking(self.lockFile.fileno(), msvcrt.LK_UNLCK, 1)
+                self.lockFile.close()
+        finally:
+            self.lockFile = None
+            self.cache.lock.release()
+
+class OutputCache:
+
+    LINK = 'link'
+    COPY = 'copy'
+
+    def __init__(self, directory, maxSize=DEFAULT_MAX_SIZE, mode=COPY, verify=False):
+        self.directory = directory
+        self.maxSize = maxSize
+        self.mode = mode
+        self.verify = verify
+        self.lock = threading.Lock()
+        os.makedirs(os.path.join(directory, OBJECTS_DIRECTORY), exist_ok=True)
+        self.entries, self.stats = self.loadIndex()
+
+    def getDirectory(self):
+        return self.directory
+
+    def getMaxSize(self):
+        return self.maxSize
+
+    def setMaxSize(self, maxSize):
+        self.maxSize = maxSize
+
+    def getMode(self):
+        return self.mode
+
+    def setMode(self, mode):
+        self.mode = mode
+
+    def getVerify(self):
+        return self.verify
+
+    def setVerify(self, verify):
+        self.verify = verify
+
+    def getStats(self):
+        with self.locked():
+            return dict(self.stats, entries=len(self.entries), size=self.getSize())
+
+    def getSize(self):
+        return sum(entry['size'] for entry in self.entries.values())
+
+    def getIndexPath(self):
+        return os.path.join(self.directory, INDEX_FILE)
+
+    def getLockPath(self):
+        return os.path.join(self.directory, LOCK_FILE)
+
+    def locked(self):
+        return IndexLock(self)
+
+    def getEntryPath(self, key):
+        return os.path.join(self.directory, OBJECTS_DIRECTORY, key)
+
+    def loadIndex(self):
+        stats = {'hits' : 0, 'misses' : 0, 'bypasses' : 0, 'evictions' : 0}
+        try:
+            with open(self.getIndexPath(), 'r') as inFile:
+                content = json.load(inFile)
+        except (OSError, ValueError):
+            return {}, stats
+        if content.get('version') != CACHE_VERSION:
+            return {}, stats
+        stats.update(content.get('stats', {}))
+        return content.get('entries', {}), stats
+
+    def saveIndex(self):
+        content = {'version' : CACHE_VERSION, 'entries' : self.entries, 'stats' : self.stats}
+        tempPath = self.getIndexPath() + '.tmp'
+        with open(tempPath, 'w') as outFile:
+            json.dump(content, outFile)
+        os.replace(tempPath, self.getIndexPath())
+
+    def getReferenceVersions(self, dataset):
+        versions = {}
+        for field in dataset.getDatafields():
+            for filePath in field.getReferenceFiles():
+                try:
+                    stat = os.stat(filePath)
+                    versions[os.path.abspath(filePath)] = [stat.st_size, stat.st_mtime_ns]
+                except OSError:
+                    versions[os.path.abspath(filePath)] = None
+        return versions
+
+    def splitFilename(self, filename):
+        stem, dot, suffix = filename.partition('.')
+        return stem, dot + suffix
+
+    def getKey(self, dataset, seed, options):
+        datafields = [[type(field).__module__ + ':' + type(field).__qualname__, field.getParameters()] for field in dataset.getDatafields()]
+        numpy = randomstreams.getNumpy()
+        material = {
+            'version' : CACHE_VERSION,
+            'n' : dataset.getN(),
+            'type' : dataset.getType(),
+            'datafields' : datafields,
+            'seed' : seed,
+            'suffix' : self.splitFilename(dataset.getFilename())[1],
+            'options' : options,
+            'references' : self.getReferenceVersions(dataset),
+            'numpy' : numpy.__version__ if numpy is not None else None
+        }
+        encoded = json.dumps(material, sort_keys=True, default=repr).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+
+    def getArtifacts(self, directory):
+        return sorted(name for name in os.listdir(directory) if name.startswith(ARTIFACT_NAME))
+
+    def getFiles(self, directory, artifacts):
+        files = []
+        for artifact in artifacts:
+            artifactPath = os.path.join(directory, artifact)
+            if not os.path.isdir(artifactPath):
+                files.append(artifact)
+                continue
+            for root, _, names in os.walk(artifactPath):
+                for name in names:
+                    files.append(os.path.relpath(os.path.join(root, name), directory))
+        return sorted(files)
+
+    def describeFile(self, filePath):
+        size, digest = utils.hashFile(filePath)
+        return [size, digest, os.stat(filePath).st_mtime_ns]
+
+    def describeFiles(self, directory, artifacts):
+        return [[path] + self.describeFile(os.path.join(directory, path)) for path in self.getFiles(directory, artifacts)]
+
+    def placeFile(self, source, destination):
+        if os.path.lexists(destination):
+            os.remove(destination)
+        if self.mode == self.LINK:
+            try:
+                os.link(source, destination)
+                return
+            except OSError:
+                pass
+        shutil.copy2(source, destination)
+
+    def placeArtifact(self, source, destination):
+        if os.path.isdir(source):
+            if os.path.isdir(destination):
+                shutil.rmtree(destination)
+            os.makedirs(destination)
+            for name in os.listdir(source):
+                self.placeArtifact(os.path.join(source, name), os.path.join(destination, name))
+        else:
+            self.placeFile(source, destination)
+
+    def materialize(self, key, entry, path, filename):
+        entryPath = self.getEntryPath(key)
+        stem = self.splitFilename(filename)[0]
+        os.makedirs(path, exist_ok=True)
+        for artifact in entry['artifacts']:
+            destination = os.path.join(path, stem + artifact[len(ARTIFACT_NAME):])
+            self.placeArtifact(os.path.join(entryPath, artifact), destination)
+
+    def isComplete(self, key, entry):
+        entryPath = self.getEntryPath(key)
+        return all(os.path.exists(os.path.join(entryPath, artifact)) for artifact in entry['artifacts'])
+
+    def isValid(self, key, entry):
+        entryPath = self.getEntryPath(key)
+        verify = self.verify or self.mode == self.LINK
+        for path, size, digest, mtime in entry['files']:
+            filePath = os.path.join(entryPath, path)
+            try:
+                stat = os.stat(filePath)
+            except OSError:
+                return False
+            if stat.st_size != size or stat.st_mtime_ns != mtime:
+                return False
+            if verify and utils.hashFile(filePath) != (size, digest):
+                return False
+        return True
+
+    def lookup(self, key):
+        with self.locked():
+            entry = self.entries.get(key)
+            if entry is not None and not self.isValid(key, entry):
+                self.removeEntry(key)
+                entry = None
+            if entry is None:
+                self.stats['misses'] += 1
+            else:
+                self.stats['hits'] += 1
+                entry['lastUsed'] = time.time()
+            self.saveIndex()
+            return entry
+
+    def store(self, key, stagingPath):
+        artifacts = self.getArtifacts(stagingPath)
+        files = self.describeFiles(stagingPath, artifacts)
+        entry = {
+            'artifacts' : artifacts,
+            'files' : files,
+            'size' : sum(file[1] for file in files),
+            'lastUsed' : time.time()
+        }
+        with self.locked():
+            entryPath = self.getEntryPath(key)
+            if key in self.entries and self.isComplete(key, self.entries[key]):
+                shutil.rmtree(stagingPath)
+                return self.entries[key]
+            if os.path.exists(entryPath):
+                shutil.rmtree(entryPath)
+            os.replace(stagingPath, entryPath)
+            self.entries[key] = entry
+            self.saveIndex()
+        return entry
+
+    def removeEntry(self, key):
+        self.entries.pop(key, None)
+        shutil.rmtree(self.getEntryPath(key), ignore_errors=True)
+
+    def removeOrphans(self):
+        objectsPath = os.path.join(self.directory, OBJECTS_DIRECTORY)
+        for key in os.listdir(objectsPath):
+            if key not in self.entries:
+                shutil.rmtree(os.path.join(objectsPath, key), ignore_errors=True)
+
+    def evict(self):
+        with self.locked():
+            self.removeOrphans()
+            size = self.getSize()
+            for key in sorted(self.entries, key=lambda key: self.entries[key]['lastUsed']):
+                if size <= self.maxSize:
+                    break
+                size -= self.entries[key]['size']
+                self.removeEntry(key)
+                self.stats['evictions'] += 1
+            self.saveIndex()
+
+    def clear(self):
+        with self.locked():
+            for key in list(self.entries):
+                self.removeEntry(key)
+            self.saveIndex()
+
+    def export(self, dataset, workers=1, seed=None, profiler=None, **options):
+        if seed is None:
+            seed = dataset.getSeed()
+        if seed is None:
+            with self.locked():
+                self.stats['bypasses'] += 1
+                self.saveIndex()
+            dataset.exportData(workers, seed, profiler, **options)
+            return False
+        key = self.getKey(dataset, seed, options)
+        entry = self.lookup(key)
+        hit = entry is not None
+        if not hit:
+            stagingPath = tempfile.mkdtemp(prefix='staging-', dir=self.directory)
+            staged = copy.copy(dataset)
+            staged.setPath(stagingPath)
+            staged.setFilename(ARTIFACT_NAME + self.splitFilename(dataset.getFilename())[1])
+            try:
+                staged.exportData(workers, seed, profiler, **options)
+            except BaseException:
+                shutil.rmtree(stagingPath, ignore_errors=True)
+                raise
+            entry = self.store(key, stagingPath)
+        self.materialize(key, entry, dataset.getPath(), dataset.getFilename())
+        self.evict()
+        return hit
@@ -0,0 +1,73 @@
+import collections
+import copy
+import os
+import random
+
+_dataset = None
+_exporter = None
+
+class EncodedBatch:
+
+    def __init__(self, rows, data):
+        self.rows = rows
+        self.data = data
+
+    def getRows(self):
+        return self.rows
+
+    def getData(self):
+        return self.data
+
+    def __len__(self):
+        return self.rows
+
+def initWorker(dataset, exporter=None):
+    global _dataset, _exporter
+    _dataset = dataset
+    _exporter = exporter
+
+def getWorkerDataset():
+    return _dataset
+
+def getWorkerExporter():
+    return _exporter
+
+def generateShard(start, stop, seed, columnar, typed):
+    return getWorkerDataset().generateSeededBatch(start, stop, seed, columnar, typed)
+
+def encodeShard(start, stop, seed):
+    dataset = getWorkerDataset()
+    exporter = getWorkerExporter()
+    batch = dataset.generateSeededBatch(start, stop, seed, exporter.COLUMNAR, exporter.TYPED)
+    return EncodedBatch(stop - start, exporter.formatBatch(dataset.getHeaders(), batch))
+
+def getShards(n, shardSize):
+    return [(start, min(start + shardSize, n)) for start in range(0, n, shardSize)]
+
+def mapShards(dataset, shardSize, workers, initargs, function, *args):
+    import concurrent.futures
+    workers = workers or os.cpu_count() or 1
+    executor = concurrent.futures.ProcessPoolExecutor(workers, initializer=initWorker, initargs=initargs)
+    pending = collections.deque()
+    try:
+        for start, stop in getShards(dataset.getN(), shardSize):
+            pending.append(executor.submit(function, start, stop, *args))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+def generateBatches(dataset, shardSize, workers=None, seed=None, columnar=False, typed=False):
+    if seed is None:
+        seed = random.getrandbits(64)
+    yield from mapShards(dataset, shardSize, workers, (dataset,), generateShard, seed, columnar, typed)
+
+def generateEncodedBatches(dataset, exporter, shardSize, workers=None, seed=None):
+    if seed is None:
+        seed = random.getrandbits(64)
+    exporter = copy.copy(exporter)
+    exporter.setProfiler(None)
+    exporter.setCounter(None)
+    yield from mapShards(dataset, shardSize, workers, (dataset, exporter), encodeShard, seed)
@@ -0,0 +1,74 @@
+import queue
+import threading
+
+QUEUE_SIZE = 4
+POLL_INTERVAL = 0.1
+
+_END = object()
+
+class BatchQueue:
+
+    def __init__(self, batches, maxSize=QUEUE_SIZE, cancelEvent=None):
+        self.batches = batches
+        self.queue = queue.Queue(maxSize)
+        self.stopEvent = threading.Event()
+        self.cancelEvent = cancelEvent if cancelEvent is not None else threading.Event()
+        self.error = None
+        self.thread = None
+
+    def getCancelEvent(self):
+        return self.cancelEvent
+
+    def isStopped(self):
+        return self.stopEvent.is_set() or self.cancelEvent.is_set()
+
+    def start(self):
+        self.thread = threading.Thread(target=self.produce, daemon=True)
+        self.thread.start()
+
+    def put(self, item):
+        while not self.isStopped():
+            try:
+                self.queue.put(item, timeout=POLL_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce(self):
+        try:
+            for batch in self.batches:
+                if not self.put(batch):
+                    return
+        except BaseException as e:
+            self.error = e
+        finally:
+            close = getattr(self.batches, 'close', None)
+            if close is not None:
+                close()
+            self.put(_END)
+
+    def __iter__(self):
+        while True:
+            if self.cancelEvent.is_set():
+                import concurrent.futures
+                raise concurrent.futures.CancelledError()
+            try:
+                item = self.queue.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            if item is _END:
+                break
+            yield item
+        if self.error is not None:
+            raise self.error
+
+    def close(self):
+        self.stopEvent.set()
+        if self.thread is not None:
+            while self.thread.is_alive():
+                try:
+                    self.queue.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    pass
+            self.thread.join()
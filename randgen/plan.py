@@ -0,0 +1,139 @@
+import copy
+import json
+import pickle
+
+from randgen.datafieldfactory import DataFieldFactory
+from randgen.datasets import Dataset
+from randgen.registry import EXPORTER_REGISTRY
+import randgen.utils as utils
+
+class GenerationPlan:
+
+    INFO_KEYS = ('n', 'title', 'filename', 'path', 'type')
+
+    def __init__(self, n, title, filename, path, type, seed=None, datafields=()):
+        self.n = n
+        self.title = title
+        self.filename = filename
+        self.path = path
+        self.type = type
+        self.seed = seed
+        self.datafields = tuple(datafields)
+        self.headers = tuple(field.getName() for field in self.datafields)
+        self.frozen = True
+
+    def __setattr__(self, name, value):
+        if getattr(self, 'frozen', False):
+            raise AttributeError('GenerationPlan is immutable')
+        super().__setattr__(name, value)
+
+    def getN(self):
+        return self.n
+
+    def getTitle(self):
+        return self.title
+
+    def getFilename(self):
+        return self.filename
+
+    def getPath(self):
+        return self.path
+
+    def getType(self):
+        return self.type
+
+    def getSeed(self):
+        return self.seed
+
+    def getDatafields(self):
+        return self.datafields
+
+    def getHeaders(self):
+        return self.headers
+
+    @classmethod
+    def validateInfo(cls, info):
+        if not isinstance(info, dict):
+            raise ValueError('Dataset entry has no info section')
+        missing = [key for key in cls.INFO_KEYS if key not in info]
+        if missing:
+            raise ValueError('Dataset info is missing: {}'.format(', '.join(missing)))
+        unknown = [key for key in info if key not in cls.INFO_KEYS and key != 'seed']
+        if unknown:
+            raise ValueError('Unknown dataset info: {}'.format(', '.join(unknown)))
+        n = info['n']
+        if isinstance(n, bool) or not isinstance(n, int) or n < 0:
+            raise ValueError('Invalid number of rows: {}'.format(n))
+        if EXPORTER_REGISTRY.get(info['type']) is None:
+            raise ValueError('Invalid export type: {}'.format(info['type']))
+
+    @classmethod
+    def compileDatafield(cls, title, datafield):
+        if not isinstance(datafield, dict):
+            raise ValueError('Invalid datafield entry in dataset {}: {}'.format(title, datafield))
+        try:
+            field = DataFieldFactory.createFromEntry(datafield)
+            if field is not None:
+                field.preload()
+        except (TypeError, ValueError, KeyError, OSError) as e:
+            raise ValueError('Invalid datafield {} in dataset {}: {}'.format(', '.join(datafield), title, e)) from e
+        return field
+
+    @classmethod
+    def compile(cls, datasetValues):
+        info = datasetValues.get('info') if isinstance(datasetValues, dict) else None
+        cls.validateInfo(info)
+        datafields = []
+        for datafield in datasetValues.get('datafields', []):
+            field = cls.compileDatafield(info['title'], datafield)
+            if field is not None:
+                datafields.append(field)
+        return cls(datafields=datafields, **info)
+
+    @classmethod
+    def fromDataset(cls, dataset):
+        return cls.compile(next(iter(dataset.jsonify().values())))
+
+    @classmethod
+    def compileFile(cls, filename):
+        if not utils.isValidFile(filename, '.json'):
+            raise ValueError('Invalid configuration file: {}'.format(filename))
+        with open(filename, 'r') as inFile:
+            content = json.load(inFile)
+        return [cls.compile(datasetValues) for datasetValues in content.values()]
+
+    def createDataset(self, **info):
+        values = {
+            'n' : self.n,
+            'title' : self.title,
+            'filename' : self.filename,
+            'path' : self.path,
+            'type' : self.type,
+            'seed' : self.seed
+        }
+        values.update(info)
+        dataset = Dataset(**values)
+        for field in self.datafields:
+            dataset.addDatafield(copy.copy(field))
+        return dataset
+
+    def generateValues(self, workers=1, seed=None, typed=False, profiler=None):
+        return self.createDataset().generateValues(workers, seed, typed, profiler)
+
+    def exportData(self, workers=1, seed=None, profiler=None, cache=None, **options):
+        return self.createDataset().exportData(workers, seed, profiler, cache, **options)
+
+    def exportSharded(self, shardRows=None, shardBytes=None, workers=1, seed=None, **options):
+        return self.createDataset().exportSharded(shardRows, shardBytes, workers, seed, **options)
+
+    def saveToFile(self, filename):
+        with open(filename, 'wb') as outFile:
+            pickle.dump(self, outFile, pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def loadFromFile(cls, filename):
+        with open(filename, 'rb') as inFile:
+            plan = pickle.load(inFile)
+        if not isinstance(plan, cls):
+            raise ValueError('{} does not contain a generation plan'.format(filename))
+        return plan
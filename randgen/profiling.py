@@ -0,0 +1,224 @@
+import time
+import tracemalloc
+
+class StageStats:
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.rows = 0
+        self.wallTime = 0.0
+        self.cpuTime = 0.0
+        self.allocatedBytes = 0
+        self.peakBytes = 0
+
+    def getName(self):
+        return self.name
+
+    def getCalls(self):
+        return self.calls
+
+    def getRows(self):
+        return self.rows
+
+    def getWallTime(self):
+        return self.wallTime
+
+    def getCpuTime(self):
+        return self.cpuTime
+
+    def getAllocatedBytes(self):
+        return self.allocatedBytes
+
+    def getPeakBytes(self):
+        return self.peakBytes
+
+    def getRowsPerSecond(self):
+        return self.rows / self.wallTime if self.wallTime > 0 else None
+
+    def add(self, sample):
+        self.calls += 1
+        self.rows += sample['rows']
+        self.wallTime += sample['wallTime']
+        self.cpuTime += sample['cpuTime']
+        self.allocatedBytes += sample['allocatedBytes']
+        self.peakBytes = max(self.peakBytes, sample['peakBytes'])
+
+    def asDict(self):
+        return {
+            'name' : self.name,
+            'calls' : self.calls,
+            'rows' : self.rows,
+            'wallTime' : self.wallTime,
+            'cpuTime' : self.cpuTime,
+            'allocatedBytes' : self.allocatedBytes,
+            'peakBytes' : self.peakBytes,
+            'rowsPerSecond' : self.getRowsPerSecond()
+        }
+
+class ProfileReport:
+
+    def __init__(self, stages, wallTime, cpuTime):
+        self.stages = stages
+        self.wallTime = wallTime
+        self.cpuTime = cpuTime
+
+    def getStages(self):
+        return list(self.stages.values())
+
+    def getStage(self, name):
+        return self.stages.get(name)
+
+    def getWallTime(self):
+        return self.wallTime
+
+    def getCpuTime(self):
+        return self.cpuTime
+
+    def asDict(self):
+        return {
+            'wallTime' : self.wallTime,
+            'cpuTime' : self.cpuTime,
+            'stages' : [stage.asDict() for stage in self.stages.values()]
+        }
+
+    def format(self):
+        lines = ['{:<32} {:>12} {:>10} {:>10} {:>14} {:>12} {:>12}'.format('stage', 'rows', 'wall (s)', 'cpu (s)', 'rows/sec', 'alloc (KiB)', 'peak (KiB)')]
+        for stage in sorted(self.stages.values(), key=lambda stage: stage.wallTime, reverse=True):
+            rowsPerSecond = stage.getRowsPerSecond()
+            lines.append('{:<32} {:>12} {:>10.3f} {:>10.3f} {:>14} {:>12.0f} {:>12.0f}'.format(stage.name, stage.rows, stage.wallTime, stage.cpuTime, '{:.0f}'.format(rowsPerSecond) if rowsPerSecond else '-', stage.allocatedBytes / 1024, stage.peakBytes / 1024))
+        lines.append('total: {:.3f} s wall, {:.3f} s cpu'.format(self.wallTime, self.cpuTime))
+        return '\n'.join(lines)
+
+class Measurement:
+
+    def __init__(self, profiler, name, rows=0):
+        self.profiler = profiler
+        self.name = name
+        self.rows = rows
+        self.wallStart = 0.0
+        self.cpuStart = 0.0
+        self.memoryStart = 0
+        self.peak = 0
+        self.childWallTime = 0.0
+        self.childCpuTime = 0.0
+
+    def setRows(self, rows):
+        self.rows = rows
+
+    def __enter__(self):
+        self.profiler.push(self)
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.profiler.pop(self)
+        return False
+
+class Profiler:
+
+    def __init__(self, callback=None, traceAllocations=True):
+        self.callback = callback
+        self.traceAllocations = traceAllocations
+        self.stages = {}
+        self.stack = []
+        self.startedTracing = False
+        self.wallStart = None
+        self.cpuStart = None
+        self.wallTime = 0.0
+        self.cpuTime = 0.0
+
+    def getCallback(self):
+        return self.callback
+
+    def setCallback(self, callback):
+        self.callback = callback
+
+    def getTraceAllocations(self):
+        return self.traceAllocations
+
+    def setTraceAllocations(self, traceAllocations):
+        self.traceAllocations = traceAllocations
+
+    def isTracing(self):
+        return self.traceAllocations and tracemalloc.is_tracing()
+
+    def start(self):
+        if self.traceAllocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.startedTracing = True
+        self.wallStart = time.perf_counter()
+        self.cpuStart = time.process_time()
+
+    def stop(self):
+        self.wallTime += time.perf_counter() - self.wallStart
+        self.cpuTime += time.process_time() - self.cpuStart
+        if self.startedTracing:
+            tracemalloc.stop()
+            self.startedTracing = False
+
+    def reset(self):
+        self.stages = {}
+        self.wallTime = 0.0
+        self.cpuTime = 0.0
+
+    def measure(self, name, rows=0):
+        return Measurement(self, name, rows)
+
+    def push(self, measurement):
+        if self.isTracing():
+            current, peak = tracemalloc.get_traced_memory()
+            if self.stack:
+                parent = self.stack[-1]
+                parent.peak = max(parent.peak, peak)
+            tracemalloc.reset_peak()
+            measurement.memoryStart = current
+            measurement.peak = current
+        self.stack.append(measurement)
+        measurement.wallStart = time.perf_counter()
+        measurement.cpuStart = time.process_time()
+
+    def pop(self, measurement):
+        wallTime = time.perf_counter() - measurement.wallStart
+        cpuTime = time.process_time() - measurement.cpuStart
+        self.stack.pop()
+        allocatedBytes = 0
+        peakBytes = 0
+        if self.isTracing():
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(measurement.peak, peak)
+            allocatedBytes = current - measurement.memoryStart
+            peakBytes = peak - measurement.memoryStart
+            tracemalloc.reset_peak()
+            if self.stack:
+                self.stack[-1].peak = max(self.stack[-1].peak, peak)
+        if self.stack:
+            parent = self.stack[-1]
+            parent.childWallTime += wallTime
+            parent.childCpuTime += cpuTime
+        sample = {
+            'stage' : measurement.name,
+            'rows' : measurement.rows,
+            'wallTime' : wallTime - measurement.childWallTime,
+            'cpuTime' : cpuTime - measurement.childCpuTime,
+            'allocatedBytes' : allocatedBytes,
+            'peakBytes' : peakBytes
+        }
+        if measurement.name not in self.stages:
+            self.stages[measurement.name] = StageStats(measurement.name)
+        self.stages[measurement.name].add(sample)
+        if self.callback is not None:
+            self.callback(sample)
+
+    def profileBatches(self, name, batches, columnar=False):
+        iterator = iter(batches)
+        while True:
+            with self.measure(name) as measurement:
+                batch = next(iterator, None)
+                if batch is not None:
+                    measurement.setRows((len(batch[0]) if batch else 0) if columnar else len(batch))
+            if batch is None:
+                return
+            yield batch
+
+    def getReport(self):
+        return ProfileReport(dict(self.stages), self.wallTime, self.cpuTime)
@@ -0,0 +1,42 @@
+import random
+
+import randgen.utils as utils
+
+np = None
+numpyLoaded = False
+defaultGenerator = None
+
+BLOCK_SIZE = 1000
+
+defaultRandom = random.Random()
+
+def getNumpy():
+    global np, numpyLoaded
+    if not numpyLoaded:
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            np = None
+        numpyLoaded = True
+    return np
+
+def getDefaultGenerator():
+    global defaultGenerator
+    if defaultGenerator is None and getNumpy() is not None:
+        defaultGenerator = np.random.default_rng()
+    return defaultGenerator
+
+def getBlockStart(rowIndex):
+    return rowIndex - rowIndex % BLOCK_SIZE
+
+def alignToBlocks(size):
+    return max(BLOCK_SIZE, size - size % BLOCK_SIZE)
+
+def createRandom(seed, *keys):
+    return random.Random(utils.deriveSeed(seed, 'random', *keys))
+
+def createGenerator(seed, *keys):
+    if getNumpy() is None:
+        return None
+    return np.random.Generator(np.random.PCG64(utils.deriveSeed(seed, 'generator', *keys)))
@@ -0,0 +1,151 @@
+import csv
+import os
+import threading
+
+CITIES_FILE = os.path.join('csv', 'cities.csv')
+COUNTRIES_FILE = os.path.join('csv', 'countries.csv')
+WEIGHT_COLUMN = 'population'
+
+def buildAliasTable(weights):
+    total = float(sum(weights))
+    count = len(weights)
+    if total <= 0:
+        return [1.0] * count, list(range(count))
+    probabilities = [weight * count / total for weight in weights]
+    aliases = list(range(count))
+    small = [index for index, probability in enumerate(probabilities) if probability < 1.0]
+    large = [index for index, probability in enumerate(probabilities) if probability >= 1.0]
+    while small and large:
+        smallIndex = small.pop()
+        largeIndex = large[-1]
+        aliases[smallIndex] = largeIndex
+        probabilities[largeIndex] -= 1.0 - probabilities[smallIndex]
+        if probabilities[largeIndex] < 1.0:
+            small.append(large.pop())
+    for index in small + large:
+        probabilities[index] = 1.0
+    return probabilities, aliases
+
+class CityTable:
+
+    def __init__(self, names, countries, ranges, weights=None):
+        self.names = names
+        self.countries = countries
+        self.ranges = ranges
+        self.rangeList = tuple(ranges[country] for country in countries)
+        self.weights = weights
+        self.aliasTables = {}
+    
+    def getNames(self):
+        return self.names
+    
+    def getCountries(self):
+        return self.countries
+    
+    def getRange(self, country):
+        return self.ranges.get(country)
+
+    def getRanges(self):
+        return self.rangeList
+
+    def hasWeights(self):
+        return self.weights is not None
+
+    def getAliasTable(self, start, stop):
+        aliasTable = self.aliasTables.get((start, stop))
+        if aliasTable is None:
+            aliasTable = buildAliasTable(self.weights[start:stop])
+            self.aliasTables[(start, stop)] = aliasTable
+        return aliasTable
+    
+    def getCities(self, country):
+        cityRange = self.ranges.get(country)
+        if cityRange is None:
+            return None
+        return self.names[cityRange[0]:cityRange[1]]
+    
+    def asDict(self):
+        return dict((country, list(self.names[start:stop])) for country, (start, stop) in self.ranges.items())
+
+class CountryTable:
+
+    def __init__(self, codes, names):
+        self.codes = codes
+        self.names = names
+    
+    def getCodes(self):
+        return self.codes
+    
+    def getNames(self):
+        return self.names
+    
+    def asList(self):
+        return [[code, name] for code, name in zip(self.codes, self.names)]
+
+def loadCities(filePath):
+    cities = {}
+    with open(filePath, 'r', encoding='utf-8') as csvFile:
+        csvReader = csv.reader(csvFile, delimiter=',')
+        headers = next(csvReader, [])
+        weightIndex = headers.index(WEIGHT_COLUMN) if WEIGHT_COLUMN in headers else None
+        for row in csvReader:
+            weight = float(row[weightIndex] or 0) if weightIndex is not None else None
+            cities.setdefault(row[1], []).append((row[0], weight))
+    names = []
+    weights = []
+    ranges = {}
+    for country, countryCities in cities.items():
+        ranges[country] = (len(names), len(names) + len(countryCities))
+        for name, weight in countryCities:
+            names.append(name)
+            weights.append(weight)
+    return CityTable(tuple(names), tuple(ranges), ranges, tuple(weights) if weightIndex is not None else None)
+
+def loadCountries(filePath):
+    codes = []
+    names = []
+    with open(filePath, 'r', encoding='utf-8') as csvFile:
+        csvReader = csv.reader(csvFile, delimiter=',')
+        next(csvReader, None)
+        for row in csvReader:
+            codes.append(row[0])
+            names.append(row[3])
+    return CountryTable(tuple(codes), tuple(names))
+
+class ReferenceDataRegistry:
+
+    entries = {}
+    lock = threading.Lock()
+
+    @classmethod
+    def getKey(cls, filePath, loader, args):
+        return (os.path.abspath(filePath), loader, args)
+
+    @classmethod
+    def get(cls, filePath, loader, *args):
+        key = cls.getKey(filePath, loader, args)
+        mtime = os.stat(filePath).st_mtime_ns
+        with cls.lock:
+            entry = cls.entries.get(key)
+            if entry is None or entry[0] != mtime:
+                entry = (mtime, loader(filePath, *args))
+                cls.entries[key] = entry
+            return entry[1]
+    
+    @classmethod
+    def invalidate(cls, filePath=None):
+        with cls.lock:
+            if filePath is None:
+                cls.entries.clear()
+            else:
+                filePath = os.path.abspath(filePath)
+                for key in [key for key in cls.entries if key[0] == filePath]:
+                    del cls.entries[key]
+
+    @classmethod
+    def getCities(cls, filePath=CITIES_FILE):
+        return cls.get(filePath, loadCities)
+
+    @classmethod
+    def getCountries(cls, filePath=COUNTRIES_FILE):
+        return cls.get(filePath, loadCountries)
@@ -0,0 +1,82 @@
+import importlib
+
+class Registry:
+
+    def __init__(self, group, entries=None):
+        self.group = group
+        self.entries = dict(entries or {})
+        self.resolved = {}
+        self.entryPointsLoaded = False
+
+    def getGroup(self):
+        return self.group
+
+    def register(self, name, target):
+        self.entries[name] = target
+        self.resolved.pop(name, None)
+
+    def unregister(self, name):
+        self.entries.pop(name, None)
+        self.resolved.pop(name, None)
+
+    def loadEntryPoints(self):
+        if self.entryPointsLoaded:
+            return
+        self.entryPointsLoaded = True
+        try:
+            from importlib.metadata import entry_points
+        except ImportError:
+            return
+        entryPoints = entry_points()
+        if hasattr(entryPoints, 'select'):
+            entryPoints = entryPoints.select(group=self.group)
+        else:
+            entryPoints = entryPoints.get(self.group, [])
+        for entryPoint in entryPoints:
+            self.entries.setdefault(entryPoint.name, entryPoint)
+
+    def resolve(self, target):
+        if isinstance(target, str):
+            moduleName, _, attribute = target.partition(':')
+            return getattr(importlib.import_module(moduleName), attribute)
+        if hasattr(target, 'load'):
+            return target.load()
+        return target
+
+    def get(self, name):
+        resolved = self.resolved.get(name)
+        if resolved is None:
+            if name not in self.entries:
+                self.loadEntryPoints()
+            if name not in self.entries:
+                return None
+            resolved = self.resolved[name] = self.resolve(self.entries[name])
+        return resolved
+
+    def getNames(self):
+        self.loadEntryPoints()
+        return list(self.entries)
+
+FIELD_REGISTRY = Registry('randgen.fields', {
+    'cityfield' : 'randgen.datafields:CityField',
+    'countryfield' : 'randgen.datafields:CountryField',
+    'datefield' : 'randgen.datafields:DateField',
+    'emailfield' : 'randgen.datafields:EmailField',
+    'incrementfield' : 'randgen.datafields:IncrementField',
+    'ipaddressfield' : 'randgen.datafields:IpAddressField',
+    'namefield' : 'randgen.datafields:NameField',
+    'numberfield' : 'randgen.datafields:NumberField',
+    'stringfield' : 'randgen.datafields:StringField',
+    'customfield' : 'randgen.datafields:CustomField'
+})
+
+EXPORTER_REGISTRY = Registry('randgen.exporters', {
+    'csv' : 'randgen.exporters:CsvExporter',
+    'json' : 'randgen.exporters:JsonExporter',
+    'jsonl' : 'randgen.exporters:JsonLinesExporter',
+    'xml' : 'randgen.exporters:XmlExporter',
+    'npy' : 'randgen.exporters:NpyExporter',
+    'npz' : 'randgen.exporters:NpzExporter',
+    'arrow' : 'randgen.exporters:ArrowExporter',
+    'parquet' : 'randgen.exporters:ParquetExporter'
+})
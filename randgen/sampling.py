@@ -0,0 +1,132 @@
+import random
+
+import randgen.randomstreams as randomstreams
+import randgen.utils as utils
+
+class UniqueSampler:
+
+    def __init__(self, populationSize):
+        self.populationSize = populationSize
+        self.drawn = 0
+    
+    def getPopulationSize(self):
+        return self.populationSize
+    
+    def remaining(self):
+        return self.populationSize - self.drawn
+
+    def checkRemaining(self, k):
+        if k > self.remaining():
+            raise ValueError('Data amount is smaller than number of unique entries required ({} data - {} unique entries required)'.format(self.remaining(), k))
+    
+    def draw(self, rng=random):
+        return self.drawBatch(1, rng)[0]
+
+    def drawBatch(self, k, rng=random):
+        pass
+
+class SetSampler(UniqueSampler):
+
+    def __init__(self, populationSize):
+        super().__init__(populationSize)
+        self.seen = set()
+    
+    def drawBatch(self, k, rng=random):
+        self.checkRemaining(k)
+        result = []
+        seen = self.seen
+        randrange = rng.randrange
+        populationSize = self.populationSize
+        while len(result) < k:
+            index = randrange(populationSize)
+            if index not in seen:
+                seen.add(index)
+                result.append(index)
+        self.drawn += k
+        return result
+
+class PermutationSampler(UniqueSampler):
+
+    def __init__(self, populationSize):
+        super().__init__(populationSize)
+        self.indices = list(range(populationSize))
+    
+    def drawBatch(self, k, rng=random):
+        self.checkRemaining(k)
+        indices = self.indices
+        randrange = rng.randrange
+        start = self.drawn
+        stop = start + k
+        for position in range(start, stop):
+            swap = randrange(position, self.populationSize)
+            indices[position], indices[swap] = indices[swap], indices[position]
+        self.drawn = stop
+        return indices[start:stop]
+
+class FeistelPermutation:
+
+    ROUNDS = 4
+    MULTIPLIER = 0x9E3779B97F4A7C15
+    MASK_64 = (1 << 64) - 1
+
+    def __init__(self, populationSize, seed):
+        self.populationSize = populationSize
+        self.halfBits = max(1, ((populationSize - 1).bit_length() + 1) // 2)
+        self.halfMask = (1 << self.halfBits) - 1
+        self.keys = [utils.deriveSeed(seed, 'feistel', populationSize, round) for round in range(self.ROUNDS)]
+    
+    def getPopulationSize(self):
+        return self.populationSize
+
+    def checkRange(self, start, stop):
+        if stop > self.populationSize:
+            raise ValueError('Data amount is smaller than number of unique entries required ({} data - {} unique entries required)'.format(self.populationSize, stop))
+
+    def permute(self, index):
+        halfBits = self.halfBits
+        halfMask = self.halfMask
+        shift = 64 - halfBits
+        multiplier = self.MULTIPLIER
+        mask = self.MASK_64
+        while True:
+            left = index >> halfBits
+            right = index & halfMask
+            for key in self.keys:
+                left, right = right, left ^ ((((right ^ key) * multiplier) & mask) >> shift)
+            index = (left << halfBits) | right
+            if index < self.populationSize:
+                return index
+
+    def permuteRange(self, start, stop):
+        self.checkRange(start, stop)
+        np = randomstreams.getNumpy()
+        if np is None:
+            return [self.permute(index) for index in range(start, stop)]
+        halfBits = np.uint64(self.halfBits)
+        halfMask = np.uint64(self.halfMask)
+        shift = np.uint64(64 - self.halfBits)
+        multiplier = np.uint64(self.MULTIPLIER)
+        keys = [np.uint64(key) for key in self.keys]
+        result = np.arange(start, stop, dtype=np.uint64)
+        pending = np.arange(len(result))
+        while len(pending):
+            values = result[pending]
+            left = values >> halfBits
+            right = values & halfMask
+            for key in keys:
+                left, right = right, left ^ (((right ^ key) * multiplier) >> shift)
+            values = (left << halfBits) | right
+            result[pending] = values
+            pending = pending[values >= self.populationSize]
+        return result.tolist()
+
+SPARSE_RATIO = 0.25
+
+def createUniqueSampler(populationSize, count=None):
+    if count is None:
+        count = populationSize
+    if count > populationSize:
+        raise ValueError('Data amount is smaller than number of unique entries required ({} data - {} unique entries required)'.format(populationSize, count))
+    if count <= populationSize * SPARSE_RATIO:
+        return SetSampler(populationSize)
+    return PermutationSampler(populationSize)
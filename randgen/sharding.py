@@ -0,0 +1,224 @@
+import copy
+import json
+import os
+import random
+import re
+import shutil
+
+from randgen.exporterfactory import ExporterFactory
+from randgen.registry import EXPORTER_REGISTRY
+import randgen.parallel as parallel
+import randgen.randomstreams as randomstreams
+import randgen.streams as streams
+import randgen.utils as utils
+
+SHARD_NAME = 'part-{:05d}'
+SHARD_PATTERN = re.compile(r'part-\d{5,}(\..*)?$')
+MANIFEST_FILE = 'manifest.json'
+CHUNK_SIZE = 1000
+PROBE_SIZE = 100
+
+def getShardName(index):
+    return SHARD_NAME.format(index)
+
+def getArtifacts(directory, name):
+    return sorted(entry for entry in os.listdir(directory) if entry == name or entry.startswith(name + '.'))
+
+def getFiles(directory, artifact):
+    artifactPath = os.path.join(directory, artifact)
+    if not os.path.isdir(artifactPath):
+        return [artifact]
+    files = []
+    for root, _, names in os.walk(artifactPath):
+        for name in names:
+            files.append(os.path.relpath(os.path.join(root, name), directory))
+    return sorted(files)
+
+def describeFile(directory, path):
+    size, digest = utils.hashFile(os.path.join(directory, path))
+    return {'path' : path.replace(os.sep, '/'), 'bytes' : size, 'sha256' : digest}
+
+def describeShard(directory, index, start, rows):
+    name = getShardName(index)
+    files = [describeFile(directory, path) for artifact in getArtifacts(directory, name) for path in getFiles(directory, artifact)]
+    return {
+        'name' : name,
+        'start' : start,
+        'rows' : rows,
+        'bytes' : sum(entry['bytes'] for entry in files),
+        'files' : files
+    }
+
+def createShardExporter(dataset, directory, index, rows, options):
+    shard = copy.copy(dataset)
+    shard.setN(rows)
+    shard.setPath(directory)
+    shard.setFilename(getShardName(index))
+    return ExporterFactory.create(shard, **options)
+
+def generateRange(dataset, start, stop, seed, columnar, typed):
+    chunkSize = randomstreams.alignToBlocks(dataset.BATCH_SIZE)
+    while start < stop:
+        chunkStop = min(start - start % chunkSize + chunkSize, stop)
+        yield dataset.generateSeededBatch(start, chunkStop, seed, columnar, typed)
+        start = chunkStop
+
+def exportShard(dataset, directory, index, start, stop, seed, options):
+    exporter = createShardExporter(dataset, directory, index, stop - start, options)
+    exporter.export(generateRange(dataset, start, stop, seed, exporter.COLUMNAR, exporter.TYPED))
+    return describeShard(directory, index, start, stop - start)
+
+def exportWorkerShard(directory, index, start, stop, seed, options):
+    return exportShard(parallel.getWorkerDataset(), directory, index, start, stop, seed, options)
+
+class ShardFeeder:
+
+    def __init__(self, batches, columnar=False):
+        self.batches = iter(batches)
+        self.columnar = columnar
+        self.batch = None
+        self.offset = 0
+        self.rows = 0
+        self.rowBytes = None
+
+    def getRows(self):
+        return self.rows
+
+    def getBatchRows(self, batch):
+        if self.columnar:
+            return len(batch[0]) if batch else 0
+        return len(batch)
+
+    def hasMore(self):
+        while self.batch is None or self.offset >= self.getBatchRows(self.batch):
+            self.batch = next(self.batches, None)
+            self.offset = 0
+            if self.batch is None:
+                return False
+        return True
+
+    def nextChunk(self, limit):
+        if not self.hasMore():
+            return None
+        lower = self.offset
+        upper = min(lower + limit, self.getBatchRows(self.batch))
+        self.offset = upper
+        if self.columnar:
+            return [column[lower:upper] for column in self.batch]
+        return self.batch[lower:upper]
+
+    def getChunkSize(self, shardRows, shardBytes, written):
+        limit = CHUNK_SIZE if shardRows is None else min(CHUNK_SIZE, shardRows - self.rows)
+        if shardBytes is None:
+            return limit
+        if self.rowBytes is None:
+            return min(limit, PROBE_SIZE)
+        return max(1, min(limit, int((shardBytes - written) / self.rowBytes)))
+
+    def feed(self, counter, shardRows=None, shardBytes=None):
+        self.rows = 0
+        written = 0
+        while shardRows is None or self.rows < shardRows:
+            chunk = self.nextChunk(self.getChunkSize(shardRows, shardBytes, written))
+            if chunk is None:
+                return
+            self.rows += self.getBatchRows(chunk)
+            yield chunk
+            if shardBytes is not None:
+                written = counter.getBytes()
+                self.rowBytes = written / self.rows
+                if written >= shardBytes:
+                    return
+
+def exportByRows(dataset, directory, shardRows, workers, seed, options):
+    shards = parallel.getShards(dataset.getN(), shardRows) or [(0, 0)]
+    if workers == 1 or len(shards) == 1:
+        return [exportShard(dataset, directory, index, start, stop, seed, options) for index, (start, stop) in enumerate(shards)]
+    import concurrent.futures
+    workers = min(workers or os.cpu_count() or 1, len(shards))
+    executor = concurrent.futures.ProcessPoolExecutor(workers, initializer=parallel.initWorker, initargs=(dataset,))
+    try:
+        futures = [executor.submit(exportWorkerShard, directory, index, start, stop, seed, options) for index, (start, stop) in enumerate(shards)]
+        return [future.result() for future in futures]
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+def exportByBytes(dataset, directory, shardRows, shardBytes, workers, seed, options):
+    exporter = createShardExporter(dataset, directory, 0, min(shardRows or dataset.getN(), dataset.getN()), options)
+    if exporter.NEEDS_ROW_COUNT:
+        raise ValueError('{} files cannot be sharded by size'.format(dataset.getType()))
+    batches = dataset.generateBatches(workers=workers, seed=seed, columnar=exporter.COLUMNAR, typed=exporter.TYPED)
+    feeder = ShardFeeder(batches, exporter.COLUMNAR)
+    shards = []
+    start = 0
+    try:
+        while True:
+            index = len(shards)
+            counter = streams.OutputCounter()
+            exporter.setCounter(counter)
+            exporter.export(feeder.feed(counter, shardRows, shardBytes))
+            shards.append(describeShard(directory, index, start, feeder.getRows()))
+            start += feeder.getRows()
+            if not feeder.hasMore():
+                return shards
+            remaining = dataset.getN() - start
+            exporter = createShardExporter(dataset, directory, index + 1, min(shardRows or remaining, remaining), options)
+    finally:
+        batches.close()
+
+def removeShards(directory):
+    for entry in os.listdir(directory):
+        entryPath = os.path.join(directory, entry)
+        if entry == MANIFEST_FILE:
+            os.remove(entryPath)
+        elif SHARD_PATTERN.match(entry):
+            if os.path.isdir(entryPath):
+                shutil.rmtree(entryPath)
+            else:
+                os.remove(entryPath)
+
+def writeManifest(directory, manifest):
+    manifestPath = os.path.join(directory, MANIFEST_FILE)
+    with open(manifestPath + '.tmp', 'w') as outFile:
+        json.dump(manifest, outFile, indent=4)
+    os.replace(manifestPath + '.tmp', manifestPath)
+
+def exportSharded(dataset, shardRows=None, shardBytes=None, workers=1, seed=None, **options):
+    if shardRows is None and shardBytes is None:
+        raise ValueError('Sharded export requires shardRows or shardBytes')
+    for limit in (shardRows, shardBytes):
+        if limit is not None and (isinstance(limit, bool) or not isinstance(limit, int) or limit <= 0):
+            raise ValueError('Invalid shard size: {}'.format(limit))
+    if seed is None:
+        seed = dataset.getSeed()
+    if seed is None and shardBytes is None:
+        seed = random.getrandbits(64)
+    filename = dataset.getFilename()
+    exporterClass = EXPORTER_REGISTRY.get(dataset.getType())
+    if options.get('compression') is None and getattr(exporterClass, 'STREAM_COMPRESSION', False):
+        filename, compression = streams.splitCompression(filename)
+        if compression is not None:
+            options['compression'] = compression
+    if exporterClass is not None:
+        options = exporterClass.getShardOptions(dataset, options)
+    directory = os.path.join(dataset.getPath(), filename)
+    os.makedirs(directory, exist_ok=True)
+    removeShards(directory)
+    for field in dataset.getDatafields():
+        field.setNumItems(dataset.getN())
+    if shardBytes is None:
+        shards = exportByRows(dataset, directory, shardRows, workers, seed, options)
+    else:
+        shards = exportByBytes(dataset, directory, shardRows, shardBytes, workers, seed, options)
+    manifest = {
+        'title' : dataset.getTitle(),
+        'type' : dataset.getType(),
+        'n' : dataset.getN(),
+        'seed' : seed,
+        'columns' : list(dataset.getHeaders()),
+        'shardRows' : shardRows,
+        'shardBytes' : shardBytes,
+        'shards' : shards
+    }
+    writeManifest(directory, manifest)
+    return manifest
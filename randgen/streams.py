@@ -0,0 +1,234 @@
+import collections
+import io
+import os
+
+import randgen.utils as utils
+
+BLOCK_SIZE = 1 << 20
+
+def compressGzip(block, level):
+    import zlib
+    compressor = zlib.compressobj(9 if level is None else level, zlib.DEFLATED, 31)
+    return compressor.compress(block) + compressor.flush()
+
+def compressBz2(block, level):
+    import bz2
+    return bz2.compress(block, 9 if level is None else level)
+
+def compressXz(block, level):
+    import lzma
+    return lzma.compress(block, lzma.FORMAT_XZ, preset=6 if level is None else level)
+
+def compressLz4(block, level):
+    lz4frame = loadModule('lz4.frame', 'lz4')
+    return lz4frame.compress(block, compression_level=0 if level is None else level)
+
+def loadModule(moduleName, packageName):
+    import importlib
+    try:
+        return importlib.import_module(moduleName)
+    except ImportError:
+        raise ImportError('{} is required for {} compression'.format(packageName, packageName)) from None
+
+def getThreadCount(threads):
+    if threads is None:
+        return os.cpu_count() or 1
+    return max(1, threads)
+
+class BlockCompressedWriter(io.RawIOBase):
+
+    def __init__(self, rawFile, compressBlock, level=None, threads=None, blockSize=BLOCK_SIZE):
+        self.rawFile = rawFile
+        self.compressBlock = compressBlock
+        self.level = level
+        self.threads = getThreadCount(threads)
+        self.blockSize = blockSize
+        self.pending = bytearray()
+        self.futures = collections.deque()
+        self.executor = None
+        self.blocks = 0
+        if self.threads > 1:
+            import concurrent.futures
+            self.executor = concurrent.futures.ThreadPoolExecutor(self.threads)
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.pending += data
+        while len(self.pending) >= self.blockSize:
+            block = bytes(self.pending[:self.blockSize])
+            del self.pending[:self.blockSize]
+            self.submit(block)
+        return len(data)
+
+    def submit(self, block):
+        self.blocks += 1
+        if self.executor is None:
+            self.rawFile.write(self.compressBlock(block, self.level))
+            return
+        self.futures.append(self.executor.submit(self.compressBlock, block, self.level))
+        while len(self.futures) > 2 * self.threads:
+            self.rawFile.write(self.futures.popleft().result())
+
+    def drain(self):
+        while self.futures:
+            self.rawFile.write(self.futures.popleft().result())
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if self.pending or not self.blocks:
+                self.submit(bytes(self.pending))
+                self.pending = bytearray()
+            self.drain()
+        finally:
+            if self.executor is not None:
+                for future in self.futures:
+                    future.cancel()
+                self.executor.shutdown()
+            self.rawFile.close()
+            super().close()
+
+class OutputCounter:
+
+    def __init__(self):
+        self.bytes = 0
+        self.streams = []
+
+    def attach(self, stream):
+        self.streams.append(stream)
+        return stream
+
+    def add(self, size):
+        self.bytes += size
+
+    def getBytes(self):
+        for stream in self.streams:
+            if not stream.closed:
+                stream.flush()
+        return self.bytes
+
+class CountingWriter(io.RawIOBase):
+
+    def __init__(self, rawFile, counter):
+        self.rawFile = rawFile
+        self.counter = counter
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        size = self.rawFile.write(data)
+        self.counter.add(size)
+        return size
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            self.rawFile.close()
+        finally:
+            super().close()
+
+class Codec:
+
+    def __init__(self, name, extension):
+        self.name = name
+        self.extension = extension
+
+    def getName(self):
+        return self.name
+
+    def getExtension(self):
+        return self.extension
+
+    def open(self, rawFile, level=None, threads=None):
+        pass
+
+class BlockCodec(Codec):
+
+    def __init__(self, name, extension, compressBlock):
+        super().__init__(name, extension)
+        self.compressBlock = compressBlock
+
+    def open(self, rawFile, level=None, threads=None):
+        return BlockCompressedWriter(rawFile, self.compressBlock, level, threads)
+
+class ZstdCodec(Codec):
+
+    def open(self, rawFile, level=None, threads=None):
+        zstandard = loadModule('zstandard', 'zstandard')
+        compressor = zstandard.ZstdCompressor(level=3 if level is None else level, threads=getThreadCount(threads) if threads != 1 else 0)
+        return compressor.stream_writer(rawFile, closefd=True, write_return_read=True)
+
+CODECS = {
+    'gzip' : BlockCodec('gzip', '.gz', compressGzip),
+    'bz2' : BlockCodec('bz2', '.bz2', compressBz2),
+    'xz' : BlockCodec('xz', '.xz', compressXz),
+    'zstd' : ZstdCodec('zstd', '.zst'),
+    'lz4' : BlockCodec('lz4', '.lz4', compressLz4)
+}
+
+def registerCodec(codec):
+    CODECS[codec.getName()] = codec
+
+def getCodec(compression):
+    if compression is None:
+        return None
+    if not compression in CODECS:
+        raise ValueError('Invalid compression: {}'.format(compression))
+    return CODECS[compression]
+
+def getCompressionExtension(compression):
+    codec = getCodec(compression)
+    return codec.getExtension() if codec is not None else ''
+
+def detectCompression(filename):
+    for codec in CODECS.values():
+        if filename.endswith(codec.getExtension()):
+            return codec.getName()
+    return None
+
+def splitCompression(filename, compression=None):
+    if compression is None:
+        compression = detectCompression(filename)
+    codecExtension = getCompressionExtension(compression)
+    if codecExtension and filename.endswith(codecExtension):
+        filename = filename[:-len(codecExtension)]
+    return filename, compression
+
+def getOutputPath(path, filename, extension, compression=None):
+    filename, compression = splitCompression(filename, compression)
+    if extension and filename.endswith(extension):
+        filename = filename[:-len(extension)]
+    return os.path.join(path, filename + extension + getCompressionExtension(compression)), compression
+
+def openBinaryOutput(filename, compression=None, bufferSize=utils.DEFAULT_BUFFER_SIZE, level=None, threads=None, counter=None):
+    if compression is None:
+        compression = detectCompression(filename)
+    codec = getCodec(compression)
+    if codec is None and counter is None:
+        return open(filename, 'wb', buffering=bufferSize)
+    if codec is None:
+        stream = open(filename, 'wb', buffering=0)
+    else:
+        rawFile = open(filename, 'wb')
+        try:
+            stream = codec.open(rawFile, level, threads)
+        except BaseException:
+            rawFile.close()
+            raise
+    if counter is not None:
+        stream = CountingWriter(stream, counter)
+    outFile = io.BufferedWriter(stream, buffer_size=bufferSize)
+    if counter is not None:
+        counter.attach(outFile)
+    return outFile
+
+def openTextOutput(filename, compression=None, bufferSize=utils.DEFAULT_BUFFER_SIZE, level=None, threads=None, counter=None, encoding='utf8'):
+    outFile = io.TextIOWrapper(openBinaryOutput(filename, compression, bufferSize, level, threads, counter), encoding=encoding)
+    if counter is not None:
+        counter.attach(outFile)
+    return outFile
@@ -1,5 +1,24 @@
+import hashlib
 import os
 
+DEFAULT_BUFFER_SIZE = 1 << 20
+
 def isValidFile(filename, extension):
     _, fileExtension = os.path.splitext(filename)
-    return fileExtension == extension
\ No newline at end of file
+    return fileExtension == extension
+
+def deriveSeed(seed, *keys):
+    material = ':'.join(str(part) for part in (seed,) + keys).encode('utf-8')
+    return int.from_bytes(hashlib.sha256(material).digest()[:8], 'little')
+
+def hashFile(filename, readSize=DEFAULT_BUFFER_SIZE):
+    digest = hashlib.sha256()
+    size = 0
+    with open(filename, 'rb') as inFile:
+        while True:
+            data = inFile.read(readSize)
+            if not data:
+                break
+            digest.update(data)
+            size += len(data)
+    return size, digest.hexdigest()